@@ -0,0 +1,136 @@
+"""
+AI Finding Analyzer
+Gets summary, severity and remediation for a finding from a single AI request
+"""
+
+import asyncio
+import json
+from ai.prompt_templates import analysis_prompt
+from ai.openai_client import get_ai_client
+from ai import summarizer, severity_classifier, remediation_generator
+
+# Fields that go into analysis_prompt, used to share one analysis between duplicate findings
+_ANALYSIS_FIELDS = ('title', 'description', 'impact', 'evidence', 'tech_stack', 'category')
+
+def analyze(vuln):
+    """
+    Analyze a vulnerability with one AI request
+    
+    Args:
+        vuln (dict): Vulnerability finding dictionary
+    
+    Returns:
+        dict: {'summary': str, 'severity': str, 'remediation': str}
+    """
+    client = get_ai_client()
+    if not client.client:
+        return _analyze_offline(vuln)
+    
+    try:
+        response = client.chat_completion(
+            analysis_prompt(vuln), max_tokens=2000, response_format={"type": "json_object"}
+        )
+    except Exception as e:
+        response = ""
+    return parse_analysis(response, vuln)
+
+def _analyze_offline(vuln):
+    """Assemble an analysis from the per-task canned responses when no AI client is configured"""
+    return {
+        'summary': summarizer.generate(vuln),
+        'severity': severity_classifier.classify(vuln),
+        'remediation': remediation_generator.suggest(vuln)
+    }
+
+def parse_analysis(response, vuln):
+    """
+    Parse the JSON object returned for an analysis prompt
+    
+    Args:
+        response (str): Raw AI response
+        vuln (dict): Vulnerability finding used for per-field fallbacks
+    
+    Returns:
+        dict: {'summary': str, 'severity': str, 'remediation': str}
+    """
+    data = {}
+    start = response.find('{')
+    end = response.rfind('}')
+    if start != -1 and end > start:
+        try:
+            data = json.loads(response[start:end + 1])
+        except ValueError:
+            data = {}
+    if not isinstance(data, dict):
+        data = {}
+    
+    existing = severity_classifier.existing_severity(vuln)
+    severity = data.get('severity')
+    if existing:
+        severity = existing
+    elif severity:
+        severity = severity_classifier.parse_ai_severity(str(severity), vuln)
+    else:
+        severity = severity_classifier.classify_by_rules(vuln)
+    
+    return {
+        'summary': str(data.get('summary') or summarizer.generate_fallback_summary(vuln)),
+        'severity': severity,
+        'remediation': str(data.get('remediation') or remediation_generator.generate_fallback_remediation(vuln))
+    }
+
+async def _analyze_one(vuln, semaphore, prompt_vuln=None):
+    """Analyze a single vulnerability while holding the concurrency semaphore"""
+    async with semaphore:
+        response = await get_ai_client().chat_completion_async(
+            analysis_prompt(prompt_vuln or vuln), max_tokens=2000, response_format={"type": "json_object"}
+        )
+    # Per-field fallbacks use the original finding, not the host-free prompt copy
+    return parse_analysis(response, vuln)
+
+async def analyze_all_async(vulns, max_concurrency=None):
+    """
+    Analyze many vulnerabilities concurrently, one request per distinct finding
+    
+    Args:
+        vulns (list): List of vulnerability findings
+        max_concurrency (int): Maximum number of in-flight AI requests
+    
+    Returns:
+        list: Analysis dicts in the same order as vulns
+    """
+    keys, unique = severity_classifier.dedupe_findings(vulns, _ANALYSIS_FIELDS, by_severity=True)
+    
+    semaphore = asyncio.Semaphore(max_concurrency or get_ai_client().max_concurrency)
+    results = await asyncio.gather(
+        *(_analyze_one(original, semaphore, prompt_vuln) for prompt_vuln, original in unique.values()),
+        return_exceptions=True
+    )
+    analyses = dict(zip(unique, results))
+    return [
+        parse_analysis("", vuln) if isinstance(analyses[key], Exception) else analyses[key]
+        for key, vuln in zip(keys, vulns)
+    ]
+
+def analyze_all(vulns, max_concurrency=None):
+    """
+    Analyze many vulnerabilities, fusing summary, severity and remediation into one request each
+    
+    Args:
+        vulns (list): List of vulnerability findings
+        max_concurrency (int): Maximum number of in-flight AI requests
+    
+    Returns:
+        list: Analysis dicts in the same order as vulns
+    """
+    if not get_ai_client().client:
+        # Offline: keep the canned per-task responses
+        summaries = summarizer.generate_all(vulns, max_concurrency)
+        severities = severity_classifier.classify_all(vulns, max_concurrency)
+        remediations = remediation_generator.suggest_all(vulns, max_concurrency)
+        return [
+            {'summary': summary, 'severity': severity, 'remediation': remediation}
+            for summary, severity, remediation in zip(summaries, severities, remediations)
+        ]
+    
+    return get_ai_client().run_async(analyze_all_async(vulns, max_concurrency))
@@ -0,0 +1,149 @@
+"""
+AI Batch Runner
+Sends a whole report's AI requests through the OpenAI Batch API
+"""
+
+import time
+from ai.prompt_templates import summary_prompt, severity_prompt, remediation_prompt
+from ai.openai_client import get_ai_client
+from ai.summarizer import generate_fallback_summary, _SUMMARY_FIELDS
+from ai.severity_classifier import (
+    parse_ai_severity, classify_by_rules, existing_severity, dedupe_findings, _SEVERITY_FIELDS
+)
+from ai.remediation_generator import generate_fallback_remediation, _REMEDIATION_FIELDS
+
+# Request kind -> (prompt builder, fields the prompt is built from)
+_BATCH_REQUESTS = {
+    'summary': (summary_prompt, _SUMMARY_FIELDS),
+    'severity': (severity_prompt, _SEVERITY_FIELDS),
+    'remediation': (remediation_prompt, _REMEDIATION_FIELDS),
+}
+
+def _plan_report_batch(findings):
+    """
+    Work out which deduplicated batch request answers each finding
+    
+    Findings whose scanner already supplied a severity get no severity request.
+    The plan only depends on the findings, so submit and apply rebuild it identically.
+    
+    Args:
+        findings (list): List of vulnerability findings
+    
+    Returns:
+        tuple: (list of kind -> custom_id per finding, dict of custom_id -> (kind, finding to send))
+    """
+    ids = [{} for _ in findings]
+    requests = {}
+    for kind, (_, fields) in _BATCH_REQUESTS.items():
+        pending = [
+            i for i, finding in enumerate(findings)
+            if kind != 'severity' or existing_severity(finding) is None
+        ]
+        keys, unique = dedupe_findings([findings[i] for i in pending], fields)
+        custom_ids = {key: f"{kind}-{n}" for n, key in enumerate(unique)}
+        for i, key in zip(pending, keys):
+            ids[i][kind] = custom_ids[key]
+        for key, (prompt_finding, _) in unique.items():
+            requests[custom_ids[key]] = (kind, prompt_finding)
+    return ids, requests
+
+def submit_report_batch(findings):
+    """
+    Submit summary, severity and remediation requests as one batch, one per distinct finding
+    
+    Args:
+        findings (list): List of vulnerability findings
+    
+    Returns:
+        str: Batch id, or None if the Batch API is unavailable or there is nothing to send
+    """
+    _, requests = _plan_report_batch(findings)
+    if not requests:
+        return None
+    
+    prompts = {
+        custom_id: _BATCH_REQUESTS[kind][0](finding)
+        for custom_id, (kind, finding) in requests.items()
+    }
+    return get_ai_client().submit_batch(prompts, max_tokens=2000)
+
+def wait_for_batch(batch_id, poll_interval=30, timeout=None):
+    """
+    Block until a submitted batch finishes
+    
+    Args:
+        batch_id (str): Batch id returned by submit_report_batch
+        poll_interval (int): Seconds between status checks
+        timeout (int): Give up after this many seconds (None waits for the full window)
+    
+    Returns:
+        dict: custom_id -> response text (empty if the batch failed or timed out)
+    """
+    client = get_ai_client()
+    started = time.monotonic()
+    
+    while True:
+        try:
+            results = client.poll_batch(batch_id)
+        except Exception as e:
+            print(f"[WARNING] Failed to check batch {batch_id}: {e}")
+            results = None
+        
+        if results is not None:
+            print(f"[OK] Batch {batch_id} returned {len(results)} responses")
+            return results
+        
+        if timeout is not None and time.monotonic() - started >= timeout:
+            print(f"[WARNING] Timed out waiting for batch {batch_id}")
+            return {}
+        
+        time.sleep(poll_interval)
+
+def apply_report_batch(findings, results):
+    """
+    Apply batch results to findings, falling back to rule-based output for missing entries
+    
+    Args:
+        findings (list): Findings in the order they were submitted
+        results (dict): custom_id -> response text from AIClient.poll_batch
+    
+    Returns:
+        list: The same findings with summary, severity and remediation filled in
+    """
+    ids, _ = _plan_report_batch(findings)
+    for finding, custom_ids in zip(findings, ids):
+        summary = results.get(custom_ids["summary"])
+        remediation = results.get(custom_ids["remediation"])
+        
+        finding["ai_summary"] = summary or generate_fallback_summary(finding)
+        finding["remediation"] = remediation or generate_fallback_remediation(finding)
+        
+        # A scanner-supplied severity is authoritative and was never sent
+        if "severity" not in custom_ids:
+            finding["severity"] = existing_severity(finding)
+            continue
+        severity = results.get(custom_ids["severity"])
+        finding["severity"] = parse_ai_severity(severity, finding) if severity else classify_by_rules(finding)
+    
+    return findings
+
+def run_report_batch(findings, poll_interval=30, timeout=None):
+    """
+    Submit, wait for and apply a report batch
+    
+    Args:
+        findings (list): List of vulnerability findings
+        poll_interval (int): Seconds between status checks
+        timeout (int): Give up after this many seconds
+    
+    Returns:
+        list: Enhanced findings, or None if the batch could not be submitted
+    """
+    if not findings:
+        return findings
+    
+    batch_id = submit_report_batch(findings)
+    if not batch_id:
+        return None
+    
+    return apply_report_batch(findings, wait_for_batch(batch_id, poll_interval, timeout))
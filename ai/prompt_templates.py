@@ -3,16 +3,16 @@ AI Prompt Templates for Security Analysis
 Structured prompts for different AI enhancement tasks
 """
 
-def summary_prompt(vuln):
-    """Generate prompt for executive summary"""
-    return f"""You are a cybersecurity analyst writing for business executives. 
+from collections import Counter
+
+# Static prompt text, built once at import; only the finding fields vary per call
+_SUMMARY_PREAMBLE = """You are a cybersecurity analyst writing for business executives. 
 
 Create a clear, non-technical summary of this security finding:
 
-Title: {vuln.get('title', 'Unknown')}
-Description: {vuln.get('description', 'No description')}
-Impact: {vuln.get('impact', 'Impact unknown')}
-Evidence: {vuln.get('evidence', 'No evidence provided')}
+"""
+
+_SUMMARY_INSTRUCTIONS = """
 
 Write a 2-3 sentence executive summary that explains:
 1. What the issue is in simple terms
@@ -21,17 +21,13 @@ Write a 2-3 sentence executive summary that explains:
 
 Executive Summary:"""
 
-def severity_prompt(vuln):
-    """Generate prompt for severity classification"""
-    return f"""You are a cybersecurity expert using CVSS and industry standards.
+_SEVERITY_PREAMBLE = """You are a cybersecurity expert using CVSS and industry standards.
 
 Analyze this vulnerability and assign a severity rating:
 
-Title: {vuln.get('title', 'Unknown')}
-Description: {vuln.get('description', 'No description')}
-Impact: {vuln.get('impact', 'Impact unknown')}
-Host/Target: {vuln.get('host', vuln.get('url', 'Unknown target'))}
-Current Severity: {vuln.get('severity', 'Not assigned')}
+"""
+
+_SEVERITY_RUBRIC = """
 
 Based on CVSS criteria, assign ONE of these severity levels:
 - Critical: Immediate threat, can cause severe damage
@@ -47,17 +43,13 @@ Consider:
 
 Severity:"""
 
-def remediation_prompt(vuln):
-    """Generate prompt for remediation suggestions"""
-    return f"""You are a cybersecurity expert providing remediation guidance.
+_REMEDIATION_PREAMBLE = """You are a cybersecurity expert providing remediation guidance.
 
 Provide specific, actionable remediation steps for this vulnerability:
 
-Title: {vuln.get('title', 'Unknown')}
-Description: {vuln.get('description', 'No description')}
-Technology: {vuln.get('tech_stack', 'Unknown technology')}
-Host/Target: {vuln.get('host', vuln.get('url', 'Unknown target'))}
-Category: {vuln.get('category', 'General')}
+"""
+
+_REMEDIATION_INSTRUCTIONS = """
 
 Provide remediation steps that include:
 1. Immediate actions (quick fixes)
@@ -69,17 +61,13 @@ Make recommendations specific to the technology stack when possible.
 
 Remediation Steps:"""
 
-def risk_assessment_prompt(vuln):
-    """Generate prompt for risk assessment"""
-    return f"""You are a risk analyst evaluating cybersecurity threats.
+_RISK_PREAMBLE = """You are a risk analyst evaluating cybersecurity threats.
 
 Assess the business risk of this security finding:
 
-Title: {vuln.get('title', 'Unknown')}
-Description: {vuln.get('description', 'No description')}
-Severity: {vuln.get('severity', 'Unknown')}
-Technology: {vuln.get('tech_stack', 'Unknown')}
-Evidence: {vuln.get('evidence', 'No evidence')}
+"""
+
+_RISK_INSTRUCTIONS = """
 
 Evaluate:
 1. Likelihood of exploitation (High/Medium/Low)
@@ -89,6 +77,109 @@ Evaluate:
 
 Risk Assessment:"""
 
+_TECHNICAL_PREAMBLE = """You are a senior security engineer providing technical analysis.
+
+Provide detailed technical analysis of this vulnerability:
+
+"""
+
+_TECHNICAL_INSTRUCTIONS = """
+
+Provide technical analysis including:
+1. Attack vectors and exploitation methods
+2. Technical impact and affected components
+3. Root cause analysis
+4. Technical remediation details
+5. Validation/testing recommendations
+
+Technical Analysis:"""
+
+_ANALYSIS_PREAMBLE = """You are a cybersecurity expert using CVSS and industry standards.
+
+Analyze this vulnerability:
+
+"""
+
+_ANALYSIS_INSTRUCTIONS = """
+
+Respond ONLY with a JSON object containing:
+- "summary": a 2-3 sentence non-technical executive summary of the issue and its business impact
+- "severity": ONE of Critical, High, Medium, Low based on CVSS criteria
+- "remediation": remediation steps covering immediate actions, long-term solutions, detection/monitoring and prevention
+
+Analysis JSON:"""
+
+# Set on host-free copies of findings whose request is shared by several hosts
+SHARED_REQUEST = '_shared_request'
+
+def _target_line(vuln):
+    """Host/Target line for a finding, left out of requests shared by several hosts"""
+    if vuln.get(SHARED_REQUEST):
+        return ""
+    return "\nHost/Target: " + str(vuln.get('host', vuln.get('url', 'Unknown target')))
+
+def summary_prompt(vuln):
+    """Generate prompt for executive summary"""
+    return "".join((
+        _SUMMARY_PREAMBLE,
+        "Title: ", str(vuln.get('title', 'Unknown')),
+        "\nDescription: ", str(vuln.get('description', 'No description')),
+        "\nImpact: ", str(vuln.get('impact', 'Impact unknown')),
+        "\nEvidence: ", str(vuln.get('evidence', 'No evidence provided')),
+        _SUMMARY_INSTRUCTIONS
+    ))
+
+def severity_prompt(vuln):
+    """Generate prompt for severity classification"""
+    return "".join((
+        _SEVERITY_PREAMBLE,
+        "Title: ", str(vuln.get('title', 'Unknown')),
+        "\nDescription: ", str(vuln.get('description', 'No description')),
+        "\nImpact: ", str(vuln.get('impact', 'Impact unknown')),
+        _target_line(vuln),
+        "\nCurrent Severity: ", str(vuln.get('severity', 'Not assigned')),
+        _SEVERITY_RUBRIC
+    ))
+
+def remediation_prompt(vuln):
+    """Generate prompt for remediation suggestions"""
+    return "".join((
+        _REMEDIATION_PREAMBLE,
+        "Title: ", str(vuln.get('title', 'Unknown')),
+        "\nDescription: ", str(vuln.get('description', 'No description')),
+        "\nTechnology: ", str(vuln.get('tech_stack', 'Unknown technology')),
+        _target_line(vuln),
+        "\nCategory: ", str(vuln.get('category', 'General')),
+        _REMEDIATION_INSTRUCTIONS
+    ))
+
+def analysis_prompt(vuln):
+    """Generate prompt for summary, severity and remediation in one request"""
+    return "".join((
+        _ANALYSIS_PREAMBLE,
+        "Title: ", str(vuln.get('title', 'Unknown')),
+        "\nDescription: ", str(vuln.get('description', 'No description')),
+        "\nImpact: ", str(vuln.get('impact', 'Impact unknown')),
+        "\nEvidence: ", str(vuln.get('evidence', 'No evidence provided')),
+        "\nTechnology: ", str(vuln.get('tech_stack', 'Unknown technology')),
+        _target_line(vuln),
+        "\nCategory: ", str(vuln.get('category', 'General')),
+        "\nCurrent Severity: ", str(vuln.get('severity', 'Not assigned')),
+        _ANALYSIS_INSTRUCTIONS
+    ))
+
+def risk_assessment_prompt(vuln):
+    """Generate prompt for risk assessment"""
+    return "".join((
+        _RISK_PREAMBLE,
+        "Title: ", str(vuln.get('title', 'Unknown')),
+        "\nDescription: ", str(vuln.get('description', 'No description')),
+        "\nSeverity: ", str(vuln.get('severity', 'Unknown')),
+        "\nTechnology: ", str(vuln.get('tech_stack', 'Unknown')),
+        "\nEvidence: ", str(vuln.get('evidence', 'No evidence')),
+        _RISK_INSTRUCTIONS
+    ))
+
 def executive_summary_prompt(findings_list):
     """Generate prompt for overall executive summary"""
     findings_summary = "\n".join([
@@ -97,17 +188,14 @@ def executive_summary_prompt(findings_list):
     ])
     
     total_findings = len(findings_list)
-    severity_counts = {}
-    for finding in findings_list:
-        severity = finding.get('severity', 'Unknown')
-        severity_counts[severity] = severity_counts.get(severity, 0) + 1
+    severity_counts = Counter(finding.get('severity', 'Unknown') for finding in findings_list)
     
     return f"""You are a CISO writing an executive summary for senior leadership.
 
 Based on this cybersecurity assessment with {total_findings} total findings:
 
 Severity Breakdown:
-{chr(10).join([f"- {sev}: {count} findings" for sev, count in severity_counts.items()])}
+{chr(10).join([f"- {sev}: {count} findings" for sev, count in severity_counts.most_common()])}
 
 Key Findings:
 {findings_summary}
@@ -122,23 +210,138 @@ Focus on business impact, not technical details. Use language appropriate for C-
 
 Executive Summary:"""
 
+def partial_summary_prompt(findings_chunk):
+    """Generate prompt summarizing one group of findings (map step of the executive summary)"""
+    findings_block = "\n".join([
+        f"- {finding.get('title', 'Unknown')} ({finding.get('severity', 'Unknown')}): {finding.get('description', 'No description')}"
+        for finding in findings_chunk
+    ])
+    
+    return f"""You are a cybersecurity analyst preparing notes for a CISO.
+
+Summarize the key risks in this group of {len(findings_chunk)} findings:
+
+{findings_block}
+
+Write 3-5 concise bullet points covering the most serious issues, recurring themes and affected areas.
+
+Summary Notes:"""
+
+def executive_summary_reduce_prompt(findings_list, partial_summaries):
+    """Generate prompt combining group summaries into the overall executive summary (reduce step)"""
+    total_findings = len(findings_list)
+    severity_counts = Counter(finding.get('severity', 'Unknown') for finding in findings_list)
+    
+    return f"""You are a CISO writing an executive summary for senior leadership.
+
+Based on this cybersecurity assessment with {total_findings} total findings:
+
+Severity Breakdown:
+{chr(10).join([f"- {sev}: {count} findings" for sev, count in severity_counts.most_common()])}
+
+Analyst Notes:
+{chr(10).join(partial_summaries)}
+
+Write a comprehensive executive summary (3-4 paragraphs) that covers:
+1. Overall security posture assessment
+2. Key risks and their business impact
+3. Priority recommendations for leadership
+4. Suggested next steps and timeline
+
+Focus on business impact, not technical details. Use language appropriate for C-level executives.
+
+Executive Summary:"""
+
 def technical_details_prompt(vuln):
     """Generate prompt for technical analysis"""
-    return f"""You are a senior security engineer providing technical analysis.
+    return "".join((
+        _TECHNICAL_PREAMBLE,
+        "Title: ", str(vuln.get('title', 'Unknown')),
+        "\nDescription: ", str(vuln.get('description', 'No description')),
+        "\nEvidence: ", str(vuln.get('evidence', 'No evidence')),
+        "\nTechnology: ", str(vuln.get('tech_stack', 'Unknown')),
+        "\nSource Tool: ", str(vuln.get('source', 'Unknown')),
+        _TECHNICAL_INSTRUCTIONS
+    ))
+
+def batch_severity_prompt(vulns):
+    """Generate prompt for classifying several findings in one request"""
+    findings_block = "\n\n".join([
+        f"""{i}. Title: {vuln.get('title', 'Unknown')}
+   Description: {vuln.get('description', 'No description')}
+   Impact: {vuln.get('impact', 'Impact unknown')}
+   Host/Target: {vuln.get('host', vuln.get('url', 'Unknown target'))}
+   Current Severity: {vuln.get('severity', 'Not assigned')}"""
+        for i, vuln in enumerate(vulns, 1)
+    ])
+    
+    return f"""You are a cybersecurity expert using CVSS and industry standards.
 
-Provide detailed technical analysis of this vulnerability:
+Analyze each of these vulnerabilities and assign a severity rating:
 
-Title: {vuln.get('title', 'Unknown')}
-Description: {vuln.get('description', 'No description')}
-Evidence: {vuln.get('evidence', 'No evidence')}
-Technology: {vuln.get('tech_stack', 'Unknown')}
-Source Tool: {vuln.get('source', 'Unknown')}
+{findings_block}
 
-Provide technical analysis including:
-1. Attack vectors and exploitation methods
-2. Technical impact and affected components
-3. Root cause analysis
-4. Technical remediation details
-5. Validation/testing recommendations
+Based on CVSS criteria, assign ONE of these severity levels to each finding:
+- Critical: Immediate threat, can cause severe damage
+- High: Significant risk, should be addressed urgently  
+- Medium: Moderate risk, should be addressed in reasonable timeframe
+- Low: Minor risk, can be addressed during routine maintenance
 
-Technical Analysis:"""
+Respond ONLY with a JSON array, one object per finding, using the finding number as id:
+[{{"id": 1, "severity": "High"}}, ...]
+
+Severity JSON:"""
+
+def batch_remediation_prompt(vulns):
+    """Generate prompt for remediation suggestions for several findings in one request"""
+    findings_block = "\n\n".join([
+        f"""{i}. Title: {vuln.get('title', 'Unknown')}
+   Description: {vuln.get('description', 'No description')}
+   Technology: {vuln.get('tech_stack', 'Unknown technology')}
+   Host/Target: {vuln.get('host', vuln.get('url', 'Unknown target'))}
+   Category: {vuln.get('category', 'General')}"""
+        for i, vuln in enumerate(vulns, 1)
+    ])
+    
+    return f"""You are a cybersecurity expert providing remediation guidance.
+
+Provide specific, actionable remediation steps for each of these vulnerabilities:
+
+{findings_block}
+
+For each finding, provide remediation steps that include:
+1. Immediate actions (quick fixes)
+2. Long-term solutions (proper fixes)
+3. Detection/monitoring recommendations
+4. Prevention measures
+
+Respond ONLY with a JSON array, one object per finding, using the finding number as id:
+[{{"id": 1, "remediation": "1. Immediate actions: ..."}}, ...]
+
+Remediation JSON:"""
+
+def batch_summary_prompt(vulns):
+    """Generate prompt for executive summaries of several findings in one request"""
+    findings_block = "\n\n".join([
+        f"""{i}. Title: {vuln.get('title', 'Unknown')}
+   Description: {vuln.get('description', 'No description')}
+   Impact: {vuln.get('impact', 'Impact unknown')}
+   Evidence: {vuln.get('evidence', 'No evidence provided')}"""
+        for i, vuln in enumerate(vulns, 1)
+    ])
+    
+    return f"""You are a cybersecurity analyst writing for business executives. 
+
+Create a clear, non-technical summary of each of these security findings:
+
+{findings_block}
+
+For each finding, write a 2-3 sentence executive summary that explains:
+1. What the issue is in simple terms
+2. Why it matters to the business
+3. The potential business impact
+
+Respond ONLY with a JSON array, one object per finding, using the finding number as id:
+[{{"id": 1, "summary": "..."}}, ...]
+
+Summary JSON:"""
@@ -0,0 +1,131 @@
+"""
+AI Rate Limiter
+Token-bucket limiter keeping OpenAI requests under per-minute request and token budgets
+"""
+
+import os
+import time
+import asyncio
+import threading
+
+# Optional exact token counting
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+def _env_limit(name):
+    """Read a positive integer limit from the environment, or None if unset or invalid"""
+    value = os.getenv(name, '').strip()
+    if not value:
+        return None
+    try:
+        limit = int(value)
+    except ValueError:
+        print(f"[WARNING] Ignoring {name}={value!r}: not an integer")
+        return None
+    return limit if limit > 0 else None
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute budget shared by all threads and event loops"""
+    
+    def __init__(self, max_rpm=None, max_tpm=None, model=None):
+        self.max_rpm = max_rpm
+        self.max_tpm = max_tpm
+        self.model = model
+        self._requests = float(max_rpm or 0)
+        self._tokens = float(max_tpm or 0)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._encoding = None
+    
+    @classmethod
+    def from_env(cls, model=None):
+        """
+        Build a limiter from OPENAI_MAX_RPM / OPENAI_MAX_TPM
+        
+        Args:
+            model (str): Model name used for token counting
+        
+        Returns:
+            RateLimiter: Limiter instance, or None if neither limit is set
+        """
+        max_rpm = _env_limit('OPENAI_MAX_RPM')
+        max_tpm = _env_limit('OPENAI_MAX_TPM')
+        if not max_rpm and not max_tpm:
+            return None
+        return cls(max_rpm, max_tpm, model)
+    
+    def count_tokens(self, prompt, max_tokens=0):
+        """
+        Estimate the tokens a request will consume (prompt plus completion budget)
+        
+        Args:
+            prompt (str): Prompt text
+            max_tokens (int): Completion token limit
+        
+        Returns:
+            int: Estimated token count
+        """
+        if TIKTOKEN_AVAILABLE:
+            try:
+                if self._encoding is None:
+                    self._encoding = tiktoken.encoding_for_model(self.model)
+                return len(self._encoding.encode(prompt)) + (max_tokens or 0)
+            except Exception as e:
+                pass
+        # Roughly four characters per token for English text
+        return len(prompt) // 4 + (max_tokens or 0)
+    
+    def _reserve(self, tokens):
+        """Take capacity for one request if available, otherwise return seconds to wait"""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated
+            self._updated = now
+            
+            wait = 0.0
+            if self.max_rpm:
+                self._requests = min(self.max_rpm, self._requests + elapsed * self.max_rpm / 60.0)
+                if self._requests < 1:
+                    wait = max(wait, (1 - self._requests) * 60.0 / self.max_rpm)
+            if self.max_tpm:
+                # A single request larger than the whole budget waits for a full bucket
+                tokens = min(tokens, self.max_tpm)
+                self._tokens = min(self.max_tpm, self._tokens + elapsed * self.max_tpm / 60.0)
+                if self._tokens < tokens:
+                    wait = max(wait, (tokens - self._tokens) * 60.0 / self.max_tpm)
+            
+            if wait == 0.0:
+                if self.max_rpm:
+                    self._requests -= 1
+                if self.max_tpm:
+                    self._tokens -= tokens
+            return wait
+    
+    def acquire(self, tokens):
+        """
+        Block until a request of the given size fits in the budget
+        
+        Args:
+            tokens (int): Estimated tokens for the request
+        """
+        while True:
+            wait = self._reserve(tokens)
+            if wait == 0.0:
+                return
+            time.sleep(wait)
+    
+    async def acquire_async(self, tokens):
+        """
+        Async variant of acquire that yields to the event loop while waiting
+        
+        Args:
+            tokens (int): Estimated tokens for the request
+        """
+        while True:
+            wait = self._reserve(tokens)
+            if wait == 0.0:
+                return
+            await asyncio.sleep(wait)
@@ -3,8 +3,13 @@ AI Remediation Generator
 Generates remediation suggestions for security findings
 """
 
-from ai.prompt_templates import remediation_prompt, technical_details_prompt
-from ai.openai_client import ai_client
+import asyncio
+from ai.prompt_templates import remediation_prompt, technical_details_prompt, batch_remediation_prompt
+from ai.openai_client import get_ai_client
+from ai.severity_classifier import parse_batch_response, dedupe_findings
+
+# Fields that go into remediation_prompt, used to share one remediation between duplicate findings
+_REMEDIATION_FIELDS = ('title', 'description', 'tech_stack', 'category')
 
 def suggest(vuln):
     """
@@ -18,12 +23,119 @@ def suggest(vuln):
     """
     try:
         prompt = remediation_prompt(vuln)
-        remediation = ai_client.chat_completion(prompt, max_tokens=2000)
+        remediation = get_ai_client().chat_completion(prompt, max_tokens=2000)
         return remediation
     except Exception as e:
         # Fallback to rule-based remediation
         return generate_fallback_remediation(vuln)
 
+def suggest_stream(vuln):
+    """
+    Stream AI-powered remediation suggestions as they are generated
+    
+    Args:
+        vuln (dict): Vulnerability finding dictionary
+        
+    Yields:
+        str: Remediation text fragments
+    """
+    try:
+        prompt = remediation_prompt(vuln)
+        yield from get_ai_client().chat_completion_stream(prompt, max_tokens=2000)
+    except Exception as e:
+        yield generate_fallback_remediation(vuln)
+
+async def _suggest_one(vuln, semaphore, prompt_vuln=None):
+    """Generate remediation for a single vulnerability while holding the concurrency semaphore"""
+    try:
+        async with semaphore:
+            return await get_ai_client().chat_completion_async(
+                remediation_prompt(prompt_vuln or vuln), max_tokens=2000
+            )
+    except Exception as e:
+        return generate_fallback_remediation(vuln)
+
+async def suggest_many_async(vulns, max_concurrency=None, prompt_vulns=None):
+    """
+    Generate remediation suggestions for many vulnerabilities concurrently
+    
+    Args:
+        vulns (list): List of vulnerability findings
+        max_concurrency (int): Maximum number of in-flight AI requests
+        prompt_vulns (list): Findings to build each prompt from (defaults to vulns);
+                             fallbacks always use vulns
+        
+    Returns:
+        list: Remediation texts in the same order as vulns
+    """
+    semaphore = asyncio.Semaphore(max_concurrency or get_ai_client().max_concurrency)
+    return await asyncio.gather(*(
+        _suggest_one(vuln, semaphore, prompt_vuln)
+        for vuln, prompt_vuln in zip(vulns, prompt_vulns or vulns)
+    ))
+
+def suggest_many(vulns, max_concurrency=None, prompt_vulns=None):
+    """
+    Synchronous wrapper around suggest_many_async
+    
+    Args:
+        vulns (list): List of vulnerability findings
+        max_concurrency (int): Maximum number of in-flight AI requests
+        prompt_vulns (list): Findings to build each prompt from (defaults to vulns)
+        
+    Returns:
+        list: Remediation texts in the same order as vulns
+    """
+    return get_ai_client().run_async(suggest_many_async(vulns, max_concurrency, prompt_vulns))
+
+def suggest_all(vulns, max_concurrency=None):
+    """
+    Generate remediation suggestions, sending one AI request per distinct finding
+    
+    Args:
+        vulns (list): List of vulnerability findings
+        max_concurrency (int): Maximum number of in-flight AI requests
+        
+    Returns:
+        list: Remediation texts in the same order as vulns
+    """
+    keys, unique = dedupe_findings(vulns, _REMEDIATION_FIELDS)
+    prompt_vulns = [prompt_vuln for prompt_vuln, _ in unique.values()]
+    originals = [original for _, original in unique.values()]
+    
+    remediations = dict(zip(unique, suggest_many(originals, max_concurrency, prompt_vulns)))
+    return [remediations[key] for key in keys]
+
+def suggest_batch(vulns, batch_size=8):
+    """
+    Generate remediation suggestions several findings at a time
+    
+    Args:
+        vulns (list): List of vulnerability findings
+        batch_size (int): Number of findings packed into each prompt
+        
+    Returns:
+        list: Remediation texts in the same order as vulns
+    """
+    results = []
+    
+    for start in range(0, len(vulns), batch_size):
+        chunk = vulns[start:start + batch_size]
+        by_id = {}
+        
+        try:
+            response = get_ai_client().chat_completion(batch_remediation_prompt(chunk), max_tokens=2000)
+            for item in parse_batch_response(response):
+                if item.get('remediation'):
+                    by_id[int(item['id'])] = str(item['remediation'])
+        except Exception as e:
+            pass
+        
+        for i, vuln in enumerate(chunk, 1):
+            results.append(by_id.get(i) or generate_fallback_remediation(vuln))
+    
+    return results
+
 def generate_technical_analysis(vuln):
     """
     Generate detailed technical analysis for a vulnerability
@@ -36,7 +148,7 @@ def generate_technical_analysis(vuln):
     """
     try:
         prompt = technical_details_prompt(vuln)
-        analysis = ai_client.chat_completion(prompt, max_tokens=2000)
+        analysis = get_ai_client().chat_completion(prompt, max_tokens=2000)
         return analysis
     except Exception as e:
         return "Technical analysis requires further investigation by security experts."
@@ -0,0 +1,109 @@
+"""
+AI Response Cache
+Persistent content-addressed cache for AI responses, keyed by prompt hash
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+from pathlib import Path
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "cybersec-ai" / "ai_cache.sqlite"
+DEFAULT_MAX_AGE = 7 * 24 * 3600
+
+class ResponseCache:
+    """
+    SQLite-backed cache of AI responses shared across runs and workers
+    
+    Responses describe scan data and are stored in plaintext, so entries
+    older than max_age seconds are ignored and evicted when the cache is opened.
+    """
+    
+    def __init__(self, path=None, max_age=DEFAULT_MAX_AGE):
+        self.path = Path(path or os.getenv('CYBERSEC_AI_CACHE', DEFAULT_CACHE_PATH))
+        self.max_age = max_age
+        self._conn = None
+        self._disabled = False
+    
+    def _connect(self):
+        """Open the database on first use"""
+        if self._conn is None and not self._disabled:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._conn = sqlite3.connect(str(self.path), isolation_level=None, check_same_thread=False)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT, ts INTEGER)"
+                )
+                if self.max_age:
+                    self._conn.execute("DELETE FROM responses WHERE ts < ?", (self._cutoff(),))
+            except Exception as e:
+                print(f"[WARNING] AI response cache unavailable: {e}")
+                self._conn = None
+                self._disabled = True
+        return self._conn
+    
+    def _cutoff(self):
+        """Oldest timestamp still considered fresh"""
+        return int(time.time() - self.max_age)
+    
+    @staticmethod
+    def make_key(model, temperature, max_tokens, prompt, response_format=None, system=None):
+        """
+        Build the cache key for a request
+        
+        Args:
+            model (str): Model name
+            temperature (float): Sampling temperature
+            max_tokens (int): Token limit
+            prompt (str): Prompt text
+            response_format (dict): Structured output mode, if any
+            system (str): System message sent with the prompt
+        
+        Returns:
+            str: Hex digest identifying the request
+        """
+        fmt = json.dumps(response_format, sort_keys=True) if response_format else ""
+        h = hashlib.blake2b(digest_size=16)
+        for part in (model, repr(temperature), repr(max_tokens), fmt, system or "", prompt):
+            h.update(str(part).encode('utf-8'))
+            h.update(b'\0')
+        return h.hexdigest()
+    
+    def get(self, key):
+        """Return the cached response for key, or None if missing or older than max_age"""
+        conn = self._connect()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute("SELECT response, ts FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or (self.max_age and row[1] < self._cutoff()):
+                return None
+            return row[0]
+        except Exception as e:
+            return None
+    
+    def set(self, key, response):
+        """Store a response under key"""
+        conn = self._connect()
+        if conn is None:
+            return
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, ts) VALUES (?, ?, ?)",
+                (key, response, int(time.time()))
+            )
+        except Exception as e:
+            print(f"[WARNING] Failed to write AI response cache: {e}")
+    
+    def clear(self):
+        """Delete every cached response"""
+        conn = self._connect()
+        if conn is None:
+            return
+        try:
+            conn.execute("DELETE FROM responses")
+        except Exception as e:
+            print(f"[WARNING] Failed to clear AI response cache: {e}")
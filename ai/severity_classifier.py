@@ -3,8 +3,130 @@ AI Severity Classifier
 Classifies vulnerability severity using AI analysis
 """
 
-from ai.prompt_templates import severity_prompt
-from ai.openai_client import ai_client
+import asyncio
+import hashlib
+import json
+import re
+from collections import Counter
+from urllib.parse import urlsplit
+from ai.prompt_templates import severity_prompt, batch_severity_prompt, SHARED_REQUEST
+from ai.openai_client import get_ai_client
+
+# Optional multi-keyword matcher for rule-based classification
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Keyword indicators per severity tier, most severe first
+_CRITICAL_INDICATORS = [
+    'sql injection', 'sqli', 'remote code execution', 'rce',
+    'command injection', 'path traversal', 'directory traversal',
+    'file upload', 'arbitrary file', 'authentication bypass',
+    'privilege escalation', 'buffer overflow'
+]
+
+_HIGH_INDICATORS = [
+    'cross-site scripting', 'xss', 'csrf', 'cross-site request forgery',
+    'session fixation', 'insecure direct object', 'security misconfiguration',
+    'sensitive data exposure', 'xml external entity', 'xxe',
+    'broken access control', 'injection'
+]
+
+_MEDIUM_INDICATORS = [
+    'information disclosure', 'information leakage', 'directory listing',
+    'version disclosure', 'banner grabbing', 'weak encryption',
+    'insecure transmission', 'missing security headers',
+    'clickjacking', 'open redirect'
+]
+
+_LOW_INDICATORS = [
+    'information', 'disclosure', 'fingerprinting', 'enumeration',
+    'default', 'test page', 'debug', 'comment', 'metadata'
+]
+
+_INDICATOR_TIERS = [
+    (4, 'Critical', _CRITICAL_INDICATORS),
+    (3, 'High', _HIGH_INDICATORS),
+    (2, 'Medium', _MEDIUM_INDICATORS),
+    (1, 'Low', _LOW_INDICATORS)
+]
+
+def _build_indicator_automaton():
+    """Compile every indicator into one Aho-Corasick automaton (keyword -> (priority, severity))"""
+    automaton = ahocorasick.Automaton()
+    for priority, severity, indicators in _INDICATOR_TIERS:
+        for indicator in indicators:
+            if indicator not in automaton or automaton.get(indicator)[0] < priority:
+                automaton.add_word(indicator, (priority, severity))
+    automaton.make_automaton()
+    return automaton
+
+_INDICATOR_AUTOMATON = _build_indicator_automaton() if AHOCORASICK_AVAILABLE else None
+
+# Regex fallback: one precompiled alternation per tier (plain substring semantics)
+_INDICATOR_PATTERNS = [
+    (severity, re.compile('|'.join(re.escape(indicator) for indicator in indicators)))
+    for _, severity, indicators in _INDICATOR_TIERS
+]
+
+# ISO timestamps, stripped before hashing findings. Addresses are not matched
+# generically, since four-part version numbers (Java 1.8.0.251) look the same;
+# only the finding's own host/URL is removed (see _own_targets_re)
+_HOST_NOISE_RE = re.compile(
+    r"\b\d{4}-\d{2}-\d{2}(?:[t ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:z|[+-]\d{2}:?\d{2})?)?\b",
+    re.IGNORECASE
+)
+
+# Fields that go into severity_prompt, used to share one severity between duplicate findings
+# (the scanner severity it also sends is part of the dedupe key)
+_SEVERITY_FIELDS = ('title', 'description', 'impact')
+
+# Severity level mentioned in an AI response, e.g. "Severity: High." or "**High**"
+_SEV_EXTRACT = re.compile(r"\b(critical|high|medium|low)\b", re.IGNORECASE)
+
+def match_indicators(*texts):
+    """
+    Find the most severe keyword indicator present in any of the texts
+    
+    Args:
+        *texts (str): Lowercased texts to scan (e.g. title and description)
+        
+    Returns:
+        str: Severity level of the most severe indicator found, or None
+    """
+    if _INDICATOR_AUTOMATON is not None:
+        best_priority, best_severity = 0, None
+        for text in texts:
+            if not text:
+                continue
+            for _, (priority, severity) in _INDICATOR_AUTOMATON.iter(text):
+                if priority > best_priority:
+                    best_priority, best_severity = priority, severity
+                    if priority == 4:
+                        return best_severity
+        return best_severity
+    
+    for severity, pattern in _INDICATOR_PATTERNS:
+        if any(pattern.search(text) for text in texts):
+            return severity
+    return None
+
+def existing_severity(vuln):
+    """
+    Return the severity supplied by the scanner if it is already a valid level
+    
+    Args:
+        vuln (dict): Vulnerability finding dictionary
+        
+    Returns:
+        str: Severity level (Critical, High, Medium, Low), or None
+    """
+    existing = str(vuln.get('severity') or '').strip().lower()
+    if existing in ('critical', 'high', 'medium', 'low'):
+        return existing.capitalize()
+    return None
 
 def classify(vuln):
     """
@@ -17,28 +139,261 @@ def classify(vuln):
         str: Severity level (Critical, High, Medium, Low)
     """
     try:
-        # If severity already exists and seems reasonable, use AI to validate/refine it
-        existing_severity = vuln.get('severity', '').lower()
+        # Scanner already assigned a valid severity, no need to ask the AI
+        existing = existing_severity(vuln)
+        if existing:
+            return existing
         
         prompt = severity_prompt(vuln)
-        ai_severity = ai_client.chat_completion(prompt)
-        
-        # Clean up AI response
-        ai_severity = ai_severity.strip().replace(':', '').replace('.', '')
-        
-        # Validate AI response
-        valid_severities = ['Critical', 'High', 'Medium', 'Low']
-        for severity in valid_severities:
-            if severity.lower() in ai_severity.lower():
-                return severity
-        
+        ai_severity = get_ai_client().chat_completion(prompt)
+        return parse_ai_severity(ai_severity, vuln)
+    
+    except Exception as e:
         # Fallback to rule-based classification
         return classify_by_rules(vuln)
+
+def parse_ai_severity(ai_severity, vuln):
+    """
+    Extract a valid severity level from an AI response
     
+    Args:
+        ai_severity (str): Raw AI response
+        vuln (dict): Vulnerability finding used for rule-based fallback
+        
+    Returns:
+        str: Severity level (Critical, High, Medium, Low)
+    """
+    # First severity word in the response wins
+    match = _SEV_EXTRACT.search(ai_severity)
+    if match:
+        return match.group(1).capitalize()
+    
+    # Fallback to rule-based classification
+    return classify_by_rules(vuln)
+
+async def _classify_one(vuln, semaphore, prompt_vuln=None):
+    """Classify a single vulnerability while holding the concurrency semaphore"""
+    try:
+        existing = existing_severity(vuln)
+        if existing:
+            return existing
+        
+        async with semaphore:
+            ai_severity = await get_ai_client().chat_completion_async(severity_prompt(prompt_vuln or vuln))
+        return parse_ai_severity(ai_severity, vuln)
     except Exception as e:
-        # Fallback to rule-based classification
         return classify_by_rules(vuln)
 
+async def classify_many_async(vulns, max_concurrency=None, prompt_vulns=None):
+    """
+    Classify many vulnerabilities concurrently
+    
+    Args:
+        vulns (list): List of vulnerability findings
+        max_concurrency (int): Maximum number of in-flight AI requests
+        prompt_vulns (list): Findings to build each prompt from (defaults to vulns);
+                             rule-based fallbacks always use vulns
+        
+    Returns:
+        list: Severity levels in the same order as vulns
+    """
+    semaphore = asyncio.Semaphore(max_concurrency or get_ai_client().max_concurrency)
+    return await asyncio.gather(*(
+        _classify_one(vuln, semaphore, prompt_vuln)
+        for vuln, prompt_vuln in zip(vulns, prompt_vulns or vulns)
+    ))
+
+def classify_many(vulns, max_concurrency=None, prompt_vulns=None):
+    """
+    Synchronous wrapper around classify_many_async
+    
+    Args:
+        vulns (list): List of vulnerability findings
+        max_concurrency (int): Maximum number of in-flight AI requests
+        prompt_vulns (list): Findings to build each prompt from (defaults to vulns)
+        
+    Returns:
+        list: Severity levels in the same order as vulns
+    """
+    return get_ai_client().run_async(classify_many_async(vulns, max_concurrency, prompt_vulns))
+
+def _own_targets_re(vuln):
+    """
+    Pattern matching the finding's own host/URL (case-insensitive), or None
+    
+    Also matches the bare host name of the URL and the host without its port,
+    as descriptions often mention those instead of the full target.
+    """
+    targets = set()
+    for key in ('host', 'url'):
+        value = vuln.get(key)
+        if not value:
+            continue
+        value = str(value)
+        targets.add(value)
+        hostname = urlsplit(value).hostname if '://' in value else value.rsplit(':', 1)[0]
+        if hostname:
+            targets.add(hostname)
+    if not targets:
+        return None
+    # Longest first so a full URL is removed before its host name
+    alternatives = sorted(targets, key=len, reverse=True)
+    return re.compile(
+        r'(?<![\w.])(?:' + '|'.join(re.escape(target) for target in alternatives) + r')(?![\w-]|\.\w)',
+        re.IGNORECASE
+    )
+
+def _strip_host_details(text, own_targets):
+    """Remove ISO timestamps and the finding's own host/URL from text"""
+    text = _HOST_NOISE_RE.sub('', text)
+    return own_targets.sub('', text) if own_targets else text
+
+def content_hash(vuln, fields=('title', 'description', 'tech_stack')):
+    """
+    SHA-256 of a finding's text fields with host-specific details removed
+    
+    The finding's own host/URL and ISO timestamps are stripped
+    so the same issue reported on different hosts or scan runs hashes the same.
+    
+    Args:
+        vuln (dict): Vulnerability finding dictionary
+        fields (tuple): Fields to include in the hash
+        
+    Returns:
+        str: Hex digest
+    """
+    own_targets = _own_targets_re(vuln)
+    digest = hashlib.sha256()
+    for field in fields:
+        text = _strip_host_details(str(vuln.get(field)), own_targets).lower()
+        digest.update(text.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+def shared_finding(vuln, fields):
+    """
+    Host-free copy of a finding for a request shared by several hosts
+    
+    Carries only the hashed fields, stripped exactly as content_hash strips
+    them, plus the scanner severity, and is marked with SHARED_REQUEST so the
+    prompts leave out their Host/Target line.
+    
+    Args:
+        vuln (dict): Representative vulnerability finding
+        fields (tuple): Fields the request is built from
+        
+    Returns:
+        dict: Finding to build the shared prompt from
+    """
+    own_targets = _own_targets_re(vuln)
+    shared = {
+        field: _strip_host_details(str(vuln[field]), own_targets)
+        for field in fields if vuln.get(field) is not None
+    }
+    if 'severity' in vuln:
+        shared['severity'] = vuln['severity']
+    shared[SHARED_REQUEST] = True
+    return shared
+
+def dedupe_findings(vulns, fields, by_severity=False):
+    """
+    Group findings that would produce the same AI request on different hosts
+    
+    Args:
+        vulns (list): List of vulnerability findings
+        fields (tuple): Fields the request is built from
+        by_severity (bool): Also split groups by the scanner-supplied severity
+        
+    Returns:
+        tuple: (key per finding, dict of key -> (finding to build the prompt from,
+               first original finding)). A key shared by several findings is sent
+               as a shared_finding copy, so no host's details end up in another
+               host's answer; fallbacks use the original, which keeps every field
+    """
+    keys = [
+        (content_hash(vuln, fields), existing_severity(vuln)) if by_severity else content_hash(vuln, fields)
+        for vuln in vulns
+    ]
+    counts = Counter(keys)
+    requests = {}
+    for key, vuln in zip(keys, vulns):
+        if key not in requests:
+            requests[key] = (shared_finding(vuln, fields) if counts[key] > 1 else vuln, vuln)
+    return keys, requests
+
+def classify_all(vulns, max_concurrency=None):
+    """
+    Classify vulnerabilities, sending one AI request per distinct finding
+    
+    Args:
+        vulns (list): List of vulnerability findings
+        max_concurrency (int): Maximum number of in-flight AI requests
+        
+    Returns:
+        list: Severity levels in the same order as vulns
+    """
+    keys, unique = dedupe_findings(vulns, _SEVERITY_FIELDS, by_severity=True)
+    prompt_vulns = [prompt_vuln for prompt_vuln, _ in unique.values()]
+    originals = [original for _, original in unique.values()]
+    severities = dict(zip(unique, classify_many(originals, max_concurrency, prompt_vulns)))
+    return [severities[key] for key in keys]
+
+def classify_batch(vulns, batch_size=8):
+    """
+    Classify vulnerabilities several at a time, one AI request per chunk
+    
+    Args:
+        vulns (list): List of vulnerability findings
+        batch_size (int): Number of findings packed into each prompt
+        
+    Returns:
+        list: Severity levels in the same order as vulns
+    """
+    results = [existing_severity(vuln) for vuln in vulns]
+    pending = [i for i, severity in enumerate(results) if severity is None]
+    
+    for start in range(0, len(pending), batch_size):
+        indices = pending[start:start + batch_size]
+        chunk = [vulns[i] for i in indices]
+        by_id = {}
+        
+        try:
+            response = get_ai_client().chat_completion(batch_severity_prompt(chunk))
+            for item in parse_batch_response(response):
+                by_id[int(item['id'])] = str(item.get('severity', ''))
+        except Exception as e:
+            pass
+        
+        for i, (index, vuln) in enumerate(zip(indices, chunk), 1):
+            if i in by_id:
+                results[index] = parse_ai_severity(by_id[i], vuln)
+            else:
+                results[index] = classify_by_rules(vuln)
+    
+    return results
+
+def parse_batch_response(response):
+    """
+    Parse the JSON array returned for a batched prompt
+    
+    Args:
+        response (str): Raw AI response
+        
+    Returns:
+        list: Parsed result objects (empty if the response is not a JSON array)
+    """
+    start = response.find('[')
+    end = response.rfind(']')
+    if start == -1 or end <= start:
+        return []
+    
+    try:
+        items = json.loads(response[start:end + 1])
+    except ValueError:
+        return []
+    
+    return [item for item in items if isinstance(item, dict) and 'id' in item]
+
 def classify_by_rules(vuln):
     """
     Fallback rule-based severity classification
@@ -58,53 +413,10 @@ def classify_by_rules(vuln):
     if existing_severity in ['critical', 'high', 'medium', 'low']:
         return existing_severity.capitalize()
     
-    # Critical severity indicators
-    critical_indicators = [
-        'sql injection', 'sqli', 'remote code execution', 'rce',
-        'command injection', 'path traversal', 'directory traversal',
-        'file upload', 'arbitrary file', 'authentication bypass',
-        'privilege escalation', 'buffer overflow'
-    ]
-    
-    # High severity indicators
-    high_indicators = [
-        'cross-site scripting', 'xss', 'csrf', 'cross-site request forgery',
-        'session fixation', 'insecure direct object', 'security misconfiguration',
-        'sensitive data exposure', 'xml external entity', 'xxe',
-        'broken access control', 'injection'
-    ]
-    
-    # Medium severity indicators
-    medium_indicators = [
-        'information disclosure', 'information leakage', 'directory listing',
-        'version disclosure', 'banner grabbing', 'weak encryption',
-        'insecure transmission', 'missing security headers',
-        'clickjacking', 'open redirect'
-    ]
-    
-    # Low severity indicators
-    low_indicators = [
-        'information', 'disclosure', 'fingerprinting', 'enumeration',
-        'default', 'test page', 'debug', 'comment', 'metadata'
-    ]
-    
-    combined_text = f"{title} {description}"
-    
-    # Check for critical indicators
-    if any(indicator in combined_text for indicator in critical_indicators):
-        return 'Critical'
-    
-    # Check for high indicators
-    if any(indicator in combined_text for indicator in high_indicators):
-        return 'High'
-    
-    # Check for medium indicators
-    if any(indicator in combined_text for indicator in medium_indicators):
-        return 'Medium'
-    
-    # Check for low indicators
-    if any(indicator in combined_text for indicator in low_indicators):
-        return 'Low'
+    # Check keyword indicators, most severe tier wins
+    indicator_severity = match_indicators(title, description)
+    if indicator_severity:
+        return indicator_severity
     
     # Check by category
     if 'web_vulnerability' in category:
@@ -119,6 +431,15 @@ def classify_by_rules(vuln):
     # Default to Medium if uncertain
     return 'Medium'
 
+# Numeric rank per severity level (higher = more severe)
+_SEV_RANK = {
+    'Critical': 4,
+    'High': 3,
+    'Medium': 2,
+    'Low': 1,
+    'Unknown': 0
+}
+
 def get_severity_score(severity):
     """
     Convert severity to numeric score for sorting
@@ -129,15 +450,7 @@ def get_severity_score(severity):
     Returns:
         int: Numeric score (higher = more severe)
     """
-    severity_scores = {
-        'Critical': 4,
-        'High': 3,
-        'Medium': 2,
-        'Low': 1,
-        'Unknown': 0
-    }
-    
-    return severity_scores.get(severity, 0)
+    return _SEV_RANK.get(severity, 0)
 
 def sort_by_severity(findings_list):
     """
@@ -149,8 +462,9 @@ def sort_by_severity(findings_list):
     Returns:
         list: Sorted findings list
     """
+    rank = _SEV_RANK.get
     return sorted(
         findings_list,
-        key=lambda x: get_severity_score(x.get('severity', 'Medium')),
+        key=lambda x: rank(x.get('severity', 'Medium'), 0),
         reverse=True
     )
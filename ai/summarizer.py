@@ -3,8 +3,18 @@ AI Summarizer
 Generates executive summaries for security findings
 """
 
-from ai.prompt_templates import summary_prompt
-from ai.openai_client import ai_client
+import asyncio
+from ai.prompt_templates import (
+    summary_prompt, batch_summary_prompt, partial_summary_prompt, executive_summary_reduce_prompt
+)
+from ai.openai_client import get_ai_client
+from ai.severity_classifier import parse_batch_response, dedupe_findings
+
+# Fields that go into summary_prompt, used to share one summary between duplicate findings
+_SUMMARY_FIELDS = ('title', 'description', 'impact', 'evidence')
+
+# Findings per map-step group; larger reports use a map-reduce executive summary
+EXECUTIVE_CHUNK_SIZE = 20
 
 def generate(vuln):
     """
@@ -18,13 +28,118 @@ def generate(vuln):
     """
     try:
         prompt = summary_prompt(vuln)
-        summary = ai_client.chat_completion(prompt)
+        summary = get_ai_client().chat_completion(prompt)
         return summary
     except Exception as e:
         # Fallback to basic summary
-        title = vuln.get('title', 'Security Finding')
-        severity = vuln.get('severity', 'Medium')
-        return f"A {severity.lower()} severity security issue was identified: {title}. This finding requires review and remediation according to security best practices."
+        return generate_fallback_summary(vuln)
+
+async def _summarize_one(vuln, semaphore):
+    """Generate the summary for a single vulnerability while holding the concurrency semaphore"""
+    async with semaphore:
+        return await get_ai_client().chat_completion_async(summary_prompt(vuln))
+
+async def generate_all_async(vulns, max_concurrency=None):
+    """
+    Generate summaries for many vulnerabilities concurrently
+    
+    Args:
+        vulns (list): List of vulnerability findings
+        max_concurrency (int): Maximum number of in-flight AI requests
+        
+    Returns:
+        list: Summary texts in the same order as vulns
+    """
+    # Identical findings on different hosts share one request
+    keys, unique = dedupe_findings(vulns, _SUMMARY_FIELDS)
+    
+    semaphore = asyncio.Semaphore(max_concurrency or get_ai_client().max_concurrency)
+    results = await asyncio.gather(
+        *(_summarize_one(prompt_vuln, semaphore) for prompt_vuln, _ in unique.values()),
+        return_exceptions=True
+    )
+    summaries = dict(zip(unique, results))
+    return [
+        generate_fallback_summary(vuln) if isinstance(summaries[key], Exception) else summaries[key]
+        for key, vuln in zip(keys, vulns)
+    ]
+
+def generate_all(vulns, max_concurrency=None):
+    """
+    Synchronous wrapper around generate_all_async
+    
+    Args:
+        vulns (list): List of vulnerability findings
+        max_concurrency (int): Maximum number of in-flight AI requests
+        
+    Returns:
+        list: Summary texts in the same order as vulns
+    """
+    return get_ai_client().run_async(generate_all_async(vulns, max_concurrency))
+
+def generate_batch(vulns, batch_size=20):
+    """
+    Generate summaries several findings at a time, one AI request per chunk
+    
+    Args:
+        vulns (list): List of vulnerability findings
+        batch_size (int): Number of findings packed into each prompt
+        
+    Returns:
+        list: Summary texts in the same order as vulns
+    """
+    results = []
+    
+    for start in range(0, len(vulns), batch_size):
+        chunk = vulns[start:start + batch_size]
+        by_id = {}
+        
+        try:
+            response = get_ai_client().chat_completion(batch_summary_prompt(chunk), max_tokens=2000)
+            for item in parse_batch_response(response):
+                if item.get('summary'):
+                    by_id[int(item['id'])] = str(item['summary'])
+        except Exception as e:
+            pass
+        
+        for i, vuln in enumerate(chunk, 1):
+            results.append(by_id.get(i) or generate_fallback_summary(vuln))
+    
+    return results
+
+def generate_fallback_summary(vuln):
+    """
+    Generate basic summary when AI is unavailable
+    
+    Args:
+        vuln (dict): Vulnerability finding dictionary
+        
+    Returns:
+        str: Basic summary text
+    """
+    title = vuln.get('title', 'Security Finding')
+    severity = vuln.get('severity', 'Medium')
+    return f"A {severity.lower()} severity security issue was identified: {title}. This finding requires review and remediation according to security best practices."
+
+async def _executive_summary_mapreduce(findings_list):
+    """Summarize findings in chunks concurrently (map), then combine the partial summaries (reduce)"""
+    client = get_ai_client()
+    chunks = [
+        findings_list[start:start + EXECUTIVE_CHUNK_SIZE]
+        for start in range(0, len(findings_list), EXECUTIVE_CHUNK_SIZE)
+    ]
+    
+    semaphore = asyncio.Semaphore(client.max_concurrency)
+    
+    async def _map(chunk):
+        async with semaphore:
+            return await client.chat_completion_async(partial_summary_prompt(chunk))
+    
+    results = await asyncio.gather(*(_map(chunk) for chunk in chunks), return_exceptions=True)
+    partial_summaries = [result for result in results if not isinstance(result, Exception)]
+    
+    prompt = executive_summary_reduce_prompt(findings_list, partial_summaries)
+    return await client.chat_completion_async(prompt, max_tokens=2000)
 
 def generate_executive_summary(findings_list):
     """
@@ -37,9 +152,13 @@ def generate_executive_summary(findings_list):
         str: Executive summary for the entire report
     """
     try:
+        if len(findings_list) > EXECUTIVE_CHUNK_SIZE:
+            # Large reports: summarize groups concurrently, then combine
+            return get_ai_client().run_async(_executive_summary_mapreduce(findings_list))
+        
         from ai.prompt_templates import executive_summary_prompt
         prompt = executive_summary_prompt(findings_list)
-        summary = ai_client.chat_completion(prompt, max_tokens=2000)
+        summary = get_ai_client().chat_completion(prompt, max_tokens=2000)
         return summary
     except Exception as e:
         # Fallback to basic summary
@@ -5,10 +5,31 @@ Automatically detects scan types and handles file processing
 """
 
 import os
+import sys
 import json
 import xml.etree.ElementTree as ET
 from pathlib import Path
 import mimetypes
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from utils.thread_output import ThreadOutput
+
+# Optional streaming JSON parser for validating large scan files
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Optional multi-signature matcher
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Scanner signatures appear in the file header or first records
+DETECT_READ_SIZE = 16384
 
 class ScanAutoDetector:
     """Automatically detect scan types and process files"""
@@ -32,6 +53,30 @@ class ScanAutoDetector:
             }
         }
         
+        # Flat (signature, scan_type) list per extension, in supported_types order
+        self._sig_table = {}
+        for scan_type, info in self.supported_types.items():
+            for extension in info['extensions']:
+                self._sig_table.setdefault(extension, []).extend(
+                    (signature.lower(), scan_type) for signature in info['signatures']
+                )
+        
+        # One automaton per extension scans the header for every signature in a single pass
+        self._sig_automata = {}
+        if AHOCORASICK_AVAILABLE:
+            for extension, signatures in self._sig_table.items():
+                self._sig_automata[extension] = self._build_automaton(signatures)
+        self._detect_cached = lru_cache(maxsize=1024)(self._detect_uncached)
+        
+    def _build_automaton(self, signatures):
+        """Compile (signature, scan_type) pairs into an automaton (signature -> (rank, scan_type))"""
+        automaton = ahocorasick.Automaton()
+        for rank, (signature, scan_type) in enumerate(signatures):
+            if signature not in automaton:
+                automaton.add_word(signature, (rank, scan_type))
+        automaton.make_automaton()
+        return automaton
+        
     def detect_scan_type(self, file_path):
         """
         Detect scan type based on file content and extension
@@ -44,37 +89,51 @@ class ScanAutoDetector:
         """
         file_path = Path(file_path)
         
-        if not file_path.exists():
+        try:
+            stat = file_path.stat()
+        except OSError:
             return None
             
+        # Cached per file version, a changed mtime or size gives a new key
+        return self._detect_cached(str(file_path), stat.st_mtime_ns, stat.st_size)
+        
+    def _detect_uncached(self, path, mtime, size):
+        """Detect scan type for one version of a file (wrapped by _detect_cached)"""
+        file_path = Path(path)
+        
         # Check file extension first
         extension = file_path.suffix.lower()
-        
-        # Try to read and analyze file content
+        signatures = self._sig_table.get(extension)
+        if not signatures:
+            return None
+            
+        # Try to read and analyze the start of the file
         try:
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+                content_lower = f.read(DETECT_READ_SIZE).lower()
                 
-            # Check for signatures in content
-            content_lower = content.lower()
-            
-            for scan_type, info in self.supported_types.items():
-                # Check if extension matches
-                if extension in info['extensions']:
-                    # Check for signatures
-                    for signature in info['signatures']:
-                        if signature in content_lower:
-                            return scan_type
-                            
+            automaton = self._sig_automata.get(extension)
+            if automaton is not None:
+                # Earliest signature in table order wins, wherever it appears
+                best = None
+                for _, (rank, scan_type) in automaton.iter(content_lower):
+                    if best is None or rank < best[0]:
+                        best = (rank, scan_type)
+                        if rank == 0:
+                            break
+                if best:
+                    return best[1]
+            else:
+                # First matching signature wins
+                for signature, scan_type in signatures:
+                    if signature in content_lower:
+                        return scan_type
+                        
         except Exception as e:
             print(f"[WARNING] Could not read file content: {e}")
             
         # Fallback to extension-based detection
-        for scan_type, info in self.supported_types.items():
-            if extension in info['extensions']:
-                return scan_type
-                
-        return None
+        return signatures[0][1]
         
     def find_scan_files(self, directory='.', recursive=True):
         """
@@ -87,30 +146,22 @@ class ScanAutoDetector:
         Returns:
             list: List of tuples (file_path, detected_type)
         """
-        directory = Path(directory)
         scan_files = []
         
-        # Extensions to look for
-        extensions = []
-        for info in self.supported_types.values():
-            extensions.extend(info['extensions'])
-            
-        # Search for files
-        if recursive:
-            for ext in extensions:
-                for file_path in directory.rglob(f'*{ext}'):
-                    if file_path.is_file():
-                        detected_type = self.detect_scan_type(file_path)
-                        if detected_type:
-                            scan_files.append((str(file_path), detected_type))
-        else:
-            for ext in extensions:
-                for file_path in directory.glob(f'*{ext}'):
-                    if file_path.is_file():
-                        detected_type = self.detect_scan_type(file_path)
-                        if detected_type:
-                            scan_files.append((str(file_path), detected_type))
-                            
+        # Extensions to look for (several scan types share one)
+        extensions = self._sig_table.keys()
+        
+        # Single pass over the tree, filtering by extension
+        for root, dirs, files in os.walk(directory):
+            if not recursive:
+                dirs.clear()
+            for name in files:
+                if os.path.splitext(name)[1].lower() in extensions:
+                    file_path = str(Path(root) / name)
+                    detected_type = self.detect_scan_type(file_path)
+                    if detected_type:
+                        scan_files.append((file_path, detected_type))
+                        
         return scan_files
         
     def validate_scan_file(self, file_path, scan_type):
@@ -126,13 +177,19 @@ class ScanAutoDetector:
         """
         try:
             if scan_type == 'nmap':
-                # Try to parse as XML
-                ET.parse(file_path)
+                # Stream-parse as XML, clearing elements so memory stays flat
+                for _, elem in ET.iterparse(str(file_path), events=('end',)):
+                    elem.clear()
                 return True
             elif scan_type in ['nuclei', 'burp']:
                 # Try to parse as JSON
-                with open(file_path, 'r') as f:
-                    json.load(f)
+                if IJSON_AVAILABLE:
+                    with open(file_path, 'rb') as f:
+                        for _ in ijson.parse(f):
+                            pass
+                else:
+                    with open(file_path, 'r') as f:
+                        json.load(f)
                 return True
         except Exception as e:
             print(f"[WARNING] File validation failed: {e}")
@@ -155,11 +212,12 @@ class ScanAutoDetector:
         if not file_path.exists():
             return None
             
+        stat = file_path.stat()
         info = {
             'path': str(file_path),
             'name': file_path.name,
-            'size': file_path.stat().st_size,
-            'modified': file_path.stat().st_mtime,
+            'size': stat.st_size,
+            'modified': stat.st_mtime,
             'extension': file_path.suffix.lower(),
             'detected_type': self.detect_scan_type(file_path),
             'mime_type': mimetypes.guess_type(str(file_path))[0],
@@ -175,16 +233,18 @@ class ScanAutoDetector:
 class AutoProcessor:
     """Automatically process scan files and generate reports"""
     
-    def __init__(self):
+    def __init__(self, max_workers=8):
         self.detector = ScanAutoDetector()
+        self.max_workers = max_workers
         
-    def process_directory(self, directory='.', output_format='html'):
+    def process_directory(self, directory='.', output_format='html', use_batch_api=False):
         """
         Process all scan files in a directory
         
         Args:
             directory (str): Directory to process
             output_format (str): Output format (html/pdf)
+            use_batch_api (bool): Send all AI requests as one OpenAI Batch API job
             
         Returns:
             list: List of generated reports
@@ -197,14 +257,100 @@ class AutoProcessor:
             
         print(f"[INFO] Found {len(scan_files)} scan files")
         
+        if use_batch_api:
+            reports = self.process_with_batch_api(scan_files, output_format)
+            if reports is not None:
+                return reports
+            print("[WARNING] Batch API unavailable, processing files individually")
+            
+        return self._generate_reports(scan_files, output_format)
+        
+    def _generate_reports(self, jobs, output_format):
+        """
+        Run generate_report for several files concurrently
+        
+        Each file's pipeline is independent and I/O-bound. Its console output is
+        buffered per worker thread and printed as one block per file, in job order.
+        
+        Args:
+            jobs (list): List of tuples (file_path, scan_type)
+            output_format (str): Output format
+            
+        Returns:
+            list: List of generated reports
+        """
+        output = ThreadOutput(sys.stdout)
+        
+        def run_job(file_path, scan_type):
+            output.capture()
+            try:
+                print(f"[INFO] Processing {file_path} as {scan_type}")
+                report = self.generate_report(file_path, scan_type, output_format)
+            finally:
+                text = output.release()
+            return report, text
+        
         reports = []
+        sys.stdout = output
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [executor.submit(run_job, file_path, scan_type) for file_path, scan_type in jobs]
+                for future in futures:
+                    report, text = future.result()
+                    output.stream.write(text)
+                    reports.append(report)
+        finally:
+            sys.stdout = output.stream
+            
+        return [report for report in reports if report]
+        
+    def process_with_batch_api(self, scan_files, output_format='html', poll_interval=30):
+        """
+        Parse every scan file, enhance all findings through one Batch API job, then export reports
+        
+        Args:
+            scan_files (list): List of tuples (file_path, scan_type)
+            output_format (str): Output format (html/pdf)
+            poll_interval (int): Seconds between batch status checks
+            
+        Returns:
+            list: List of generated reports, or None if the batch could not be submitted
+        """
+        from parsers import nmap_parser, burp_parser, nuclei_parser
+        from main import export_report
+        from ai.batch_runner import run_report_batch
+        
+        parsers = {'nmap': nmap_parser, 'burp': burp_parser, 'nuclei': nuclei_parser}
+        
+        # Collect all findings first so they go out in a single batch
+        parsed = []
+        all_findings = []
         for file_path, scan_type in scan_files:
-            print(f"[INFO] Processing {file_path} as {scan_type}")
+            try:
+                findings = parsers[scan_type].parse(file_path)
+            except Exception as e:
+                print(f"[ERROR] Failed to parse {file_path}: {e}")
+                continue
+            parsed.append((file_path, findings))
+            all_findings.extend(findings)
             
-            # Generate report
-            report_path = self.generate_report(file_path, scan_type, output_format)
-            if report_path:
-                reports.append(report_path)
+        if not all_findings:
+            print("[INFO] No findings to submit to the Batch API")
+            return []
+            
+        print(f"[INFO] Submitting {len(all_findings)} findings to the Batch API")
+        if run_report_batch(all_findings, poll_interval) is None:
+            return None
+            
+        reports = []
+        for file_path, findings in parsed:
+            try:
+                # Same export step as generate_full_report, so both paths produce identical reports
+                report_path = export_report(findings, os.path.splitext(file_path)[0], output_format)
+                if report_path:
+                    reports.append(report_path)
+            except Exception as e:
+                print(f"[ERROR] Failed to generate report for {file_path}: {e}")
                 
         return reports
         
@@ -220,30 +366,10 @@ class AutoProcessor:
         Returns:
             str: Path to generated report or None
         """
-        import subprocess
-        import sys
-        
         try:
-            # Run main.py full-report
-            cmd = [
-                sys.executable, 'main.py', 'full-report',
-                '--input', file_path,
-                '--type', scan_type,
-                '--format', output_format
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            if result.returncode == 0:
-                # Extract report path from output
-                output_lines = result.stdout.split('\n')
-                for line in output_lines:
-                    if 'report completed:' in line or 'report generated:' in line:
-                        report_path = line.split(':')[-1].strip()
-                        return report_path
-                        
-            else:
-                print(f"[ERROR] Report generation failed: {result.stderr}")
+            # Run the full-report pipeline in-process, reusing the loaded modules and AI client
+            from main import generate_full_report
+            return generate_full_report(file_path, scan_type, output_format)
                 
         except Exception as e:
             print(f"[ERROR] Failed to generate report: {e}")
@@ -261,20 +387,16 @@ class AutoProcessor:
         Returns:
             list: List of generated reports
         """
-        reports = []
-        
+        jobs = []
         for file_path in file_list:
             detected_type = self.detector.detect_scan_type(file_path)
             
             if detected_type:
-                print(f"[INFO] Processing {file_path} as {detected_type}")
-                report_path = self.generate_report(file_path, detected_type, output_format)
-                if report_path:
-                    reports.append(report_path)
+                jobs.append((file_path, detected_type))
             else:
                 print(f"[WARNING] Could not detect type for {file_path}")
                 
-        return reports
+        return self._generate_reports(jobs, output_format)
 
 def main():
     """CLI interface for auto-detection"""
@@ -287,6 +409,8 @@ def main():
                        help='Output format')
     parser.add_argument('--detect-only', action='store_true', 
                        help='Only detect files, do not process')
+    parser.add_argument('--batch', action='store_true',
+                       help='Use the OpenAI Batch API (half price, results within 24h)')
     
     args = parser.parse_args()
     
@@ -315,7 +439,7 @@ def main():
                 print(f"  {file_path} -> {scan_type}")
                 
             if not args.detect_only:
-                reports = processor.process_directory(args.directory, args.format)
+                reports = processor.process_directory(args.directory, args.format, use_batch_api=args.batch)
                 print(f"\nGenerated {len(reports)} reports:")
                 for report in reports:
                     print(f"  {report}")
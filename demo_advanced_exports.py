@@ -104,11 +104,10 @@ try:
     
     print("\n🎉 Demo Complete!")
     print("\nGenerated Files:")
-    import glob
-    for pattern in ["demo_*"]:
-        for file_path in glob.glob(pattern):
-            size = os.path.getsize(file_path)
-            print(f"  📄 {file_path} ({size} bytes)")
+    with os.scandir('.') as entries:
+        for entry in entries:
+            if entry.name.startswith('demo_') and entry.is_file():
+                print(f"  📄 {entry.name} ({entry.stat().st_size} bytes)")
     
     print("\n📖 Usage Examples:")
     print("  python main.py full-report -i scan.xml -fmt executive")
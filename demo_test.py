@@ -8,26 +8,29 @@ import subprocess
 import sys
 import os
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 def run_command(cmd, description):
-    """Run a command and show the result"""
-    print(f"\n{'='*60}")
-    print(f"🧪 {description}")
-    print(f"{'='*60}")
-    print(f"Command: {cmd}")
-    print("-" * 60)
+    """Run a command and return whether it passed along with its formatted output"""
+    lines = [
+        f"\n{'='*60}",
+        f"🧪 {description}",
+        f"{'='*60}",
+        f"Command: {cmd}",
+        "-" * 60
+    ]
     
     try:
         result = subprocess.run(cmd, shell=True, capture_output=True, text=True, cwd=Path(__file__).parent)
         if result.stdout:
-            print(result.stdout)
+            lines.append(result.stdout)
         if result.stderr:
-            print("STDERR:", result.stderr)
-        print(f"Exit code: {result.returncode}")
-        return result.returncode == 0
+            lines.append(f"STDERR: {result.stderr}")
+        lines.append(f"Exit code: {result.returncode}")
+        return result.returncode == 0, "\n".join(lines)
     except Exception as e:
-        print(f"[ERROR] Error running command: {e}")
-        return False
+        lines.append(f"[ERROR] Error running command: {e}")
+        return False, "\n".join(lines)
 
 def main():
     """Run comprehensive demo test"""
@@ -37,39 +40,49 @@ def main():
     # Get Python executable path
     python_exe = '"C:/Users/27668/OneDrive - Riphah International University/Documents/CYB-8-1 AI-Reporting_tool/.venv/Scripts/python.exe"'
     
-    tests = [
-        # 1. Test CLI Help
-        (f"{python_exe} main.py --help", "Testing CLI Help"),
-        
-        # 2. Test Parsers
-        (f"{python_exe} main.py parse --input data/sample_inputs/nmap_sample.xml --type nmap --output test_nmap_parsed.json", "Testing Nmap Parser"),
-        (f"{python_exe} main.py parse --input data/sample_inputs/burp_sample.xml --type burp --output test_burp_parsed.json", "Testing Burp Parser"),
-        (f"{python_exe} main.py parse --input data/sample_inputs/nuclei_sample.json --type nuclei --output test_nuclei_parsed.json", "Testing Nuclei Parser"),
-        
-        # 3. Test AI Enhancement
-        (f"{python_exe} main.py enhance --file test_nmap_parsed.json --output test_enhanced.json", "Testing AI Enhancement"),
-        
-        # 4. Test Export
-        (f"{python_exe} main.py export --file test_enhanced.json --format html --output test_export.html", "Testing HTML Export"),
-        
-        # 5. Test Full Report Generation
-        (f"{python_exe} main.py full-report --input data/sample_inputs/nmap_sample.xml --type nmap --format html", "Testing Full Report Pipeline"),
-        
-        # 6. Test Tools
-        (f"{python_exe} main.py tools list", "Testing Tools Listing"),
+    # Each stage only depends on files produced by earlier stages, so the
+    # commands inside a stage run concurrently
+    stages = [
+        [
+            # 1. Test CLI Help
+            (f"{python_exe} main.py --help", "Testing CLI Help"),
+            
+            # 2. Test Parsers
+            (f"{python_exe} main.py parse --input data/sample_inputs/nmap_sample.xml --type nmap --output test_nmap_parsed.json", "Testing Nmap Parser"),
+            (f"{python_exe} main.py parse --input data/sample_inputs/burp_sample.xml --type burp --output test_burp_parsed.json", "Testing Burp Parser"),
+            (f"{python_exe} main.py parse --input data/sample_inputs/nuclei_sample.json --type nuclei --output test_nuclei_parsed.json", "Testing Nuclei Parser"),
+            
+            # 5. Test Full Report Generation
+            (f"{python_exe} main.py full-report --input data/sample_inputs/nmap_sample.xml --type nmap --format html", "Testing Full Report Pipeline"),
+            
+            # 6. Test Tools
+            (f"{python_exe} main.py tools list", "Testing Tools Listing"),
+        ],
+        [
+            # 3. Test AI Enhancement
+            (f"{python_exe} main.py enhance --file test_nmap_parsed.json --output test_enhanced.json", "Testing AI Enhancement"),
+        ],
+        [
+            # 4. Test Export
+            (f"{python_exe} main.py export --file test_enhanced.json --format html --output test_export.html", "Testing HTML Export"),
+        ],
     ]
     
     passed = 0
     failed = 0
     
-    for cmd, description in tests:
-        success = run_command(cmd, description)
-        if success:
-            passed += 1
-            print("[OK] PASSED")
-        else:
-            failed += 1
-            print("[ERROR] FAILED")
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 4) as executor:
+        for tests in stages:
+            # map keeps results in submission order so output is not interleaved
+            results = executor.map(lambda test: run_command(*test), tests)
+            for success, output in results:
+                print(output)
+                if success:
+                    passed += 1
+                    print("[OK] PASSED")
+                else:
+                    failed += 1
+                    print("[ERROR] FAILED")
     
     # Summary
     print(f"\n{'='*60}")
@@ -6,9 +6,13 @@ Diagnoses common issues and provides fixes
 
 import os
 import sys
-import subprocess
+import io
+import asyncio
+import importlib.util
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import json
+from utils.thread_output import ThreadOutput
 
 def print_header(title):
     """Print formatted header"""
@@ -43,15 +47,23 @@ def check_dependencies():
         'python-multipart', 'aiofiles', 'python-docx'
     ]
     
+    # Import names that differ from the pip package name
+    import_names = {
+        'pyyaml': 'yaml',
+        'python-multipart': 'multipart',
+        'python-docx': 'docx'
+    }
+    
     missing = []
     working = []
     
     for package in required_packages:
-        try:
-            __import__(package.replace('-', '_'))
+        # find_spec locates the package without executing it (weasyprint is slow to import)
+        module_name = import_names.get(package, package.replace('-', '_'))
+        if importlib.util.find_spec(module_name) is not None:
             working.append(package)
             print(f"✅ {package}")
-        except ImportError:
+        else:
             missing.append(package)
             print(f"❌ {package}")
     
@@ -63,6 +75,27 @@ def check_dependencies():
         print("✅ All Python dependencies are installed")
         return True
 
+async def _probe(cmd, timeout=5):
+    """Run a version command, returning (returncode, stdout) or (None, error) if it cannot run"""
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+    except Exception as e:
+        return None, str(e)
+    
+    try:
+        stdout, _ = await asyncio.wait_for(process.communicate(), timeout)
+        return process.returncode, stdout.decode(errors='replace')
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        return None, f"timed out after {timeout}s"
+
+async def _probe_all(commands):
+    """Run all version probes concurrently"""
+    return await asyncio.gather(*(_probe(cmd) for cmd in commands))
+
 def check_system_dependencies():
     """Check system dependencies for PDF generation"""
     print_section("System Dependencies Check")
@@ -73,46 +106,44 @@ def check_system_dependencies():
         from weasyprint import HTML
         # Test basic HTML to PDF conversion
         test_html = "<html><body><h1>Test</h1></body></html>"
-        HTML(string=test_html).write_pdf("/tmp/test.pdf")
-        os.remove("/tmp/test.pdf")
+        HTML(string=test_html).write_pdf(target=io.BytesIO())
         print("✅ WeasyPrint is working")
         weasyprint_ok = True
     except Exception as e:
         print(f"❌ WeasyPrint failed: {e}")
         weasyprint_ok = False
     
+    # Probe wkhtmltopdf and Chrome binaries at the same time
+    chrome_commands = ['google-chrome', 'chromium-browser', 'chromium']
+    probes = asyncio.run(_probe_all(
+        [['wkhtmltopdf', '--version']] + [[cmd, '--version'] for cmd in chrome_commands]
+    ))
+    
     # Check wkhtmltopdf
     print("wkhtmltopdf PDF generation:")
-    try:
-        result = subprocess.run(['wkhtmltopdf', '--version'], 
-                              capture_output=True, text=True, timeout=5)
-        if result.returncode == 0:
-            print("✅ wkhtmltopdf is available")
-            print(f"   Version: {result.stdout.split()[1]}")
-            wkhtmltopdf_ok = True
-        else:
-            print("❌ wkhtmltopdf failed")
-            wkhtmltopdf_ok = False
-    except Exception as e:
-        print(f"❌ wkhtmltopdf not found: {e}")
+    returncode, output = probes[0]
+    if returncode == 0:
+        print("✅ wkhtmltopdf is available")
+        version = output.split()
+        print(f"   Version: {version[1] if len(version) > 1 else output.strip()}")
+        wkhtmltopdf_ok = True
+    elif returncode is None:
+        print(f"❌ wkhtmltopdf not found: {output}")
+        wkhtmltopdf_ok = False
+    else:
+        print("❌ wkhtmltopdf failed")
         wkhtmltopdf_ok = False
     
     # Check Chrome headless
     print("Chrome headless PDF generation:")
-    chrome_commands = ['google-chrome', 'chromium-browser', 'chromium']
     chrome_ok = False
     
-    for cmd in chrome_commands:
-        try:
-            result = subprocess.run([cmd, '--version'], 
-                                  capture_output=True, text=True, timeout=5)
-            if result.returncode == 0:
-                print(f"✅ {cmd} is available")
-                print(f"   Version: {result.stdout.strip()}")
-                chrome_ok = True
-                break
-        except:
-            continue
+    for cmd, (returncode, output) in zip(chrome_commands, probes[1:]):
+        if returncode == 0:
+            print(f"✅ {cmd} is available")
+            print(f"   Version: {output.strip()}")
+            chrome_ok = True
+            break
     
     if not chrome_ok:
         print("❌ Chrome/Chromium not found")
@@ -152,7 +183,18 @@ def check_openai_config():
             print("❌ OpenAI API key not configured")
             return False
         
-        # Test API key
+        # Validate key format locally
+        if not (api_key.startswith('sk-') and len(api_key) > 20):
+            print("❌ OpenAI API key format looks invalid (expected 'sk-...')")
+            return False
+        
+        # Live API test only when explicitly requested (costs a network round-trip and tokens)
+        if os.environ.get('DIAGNOSE_LIVE_OPENAI') != '1':
+            print("✅ OpenAI API key is configured")
+            print(f"   Model: {config.get('openai', {}).get('model', 'gpt-3.5-turbo')}")
+            print("   Set DIAGNOSE_LIVE_OPENAI=1 to test the key against the API")
+            return True
+        
         try:
             from openai import OpenAI
             client = OpenAI(api_key=api_key)
@@ -161,7 +203,8 @@ def check_openai_config():
             response = client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[{"role": "user", "content": "Hello"}],
-                max_tokens=5
+                max_tokens=5,
+                timeout=5
             )
             
             print("✅ OpenAI API key is working")
@@ -193,15 +236,19 @@ def check_file_structure():
     missing_dirs = []
     missing_files = []
     
+    # One directory read instead of a stat per required entry
+    with os.scandir('.') as entries:
+        present = {entry.name for entry in entries}
+    
     for dir_name in required_dirs:
-        if not Path(dir_name).exists():
+        if dir_name not in present:
             missing_dirs.append(dir_name)
             print(f"❌ Missing directory: {dir_name}")
         else:
             print(f"✅ {dir_name}/")
     
     for file_name in required_files:
-        if not Path(file_name).exists():
+        if file_name not in present:
             missing_files.append(file_name)
             print(f"❌ Missing file: {file_name}")
         else:
@@ -325,12 +372,28 @@ def main():
     
     results = {}
     
-    for name, check_func in checks:
+    # Checks are independent, so run them concurrently and print each one's
+    # output in order once they finish
+    output = ThreadOutput(sys.stdout)
+    
+    def run_check(name, check_func):
+        output.capture()
         try:
-            results[name] = check_func()
+            result = check_func()
         except Exception as e:
             print(f"❌ {name} check failed: {e}")
-            results[name] = False
+            result = False
+        return result, output.release()
+    
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+            futures = [(name, executor.submit(run_check, name, check_func)) for name, check_func in checks]
+            for name, future in futures:
+                results[name], text = future.result()
+                output.stream.write(text)
+    finally:
+        sys.stdout = output.stream
     
     # Summary
     print_section("Summary")
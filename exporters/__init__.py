@@ -13,43 +13,186 @@ Features:
 - Watermarking and branding support
 """
 
-# Legacy imports for backward compatibility
-from .html_generator import export as export_html
-from .pdf_exporter import export as export_pdf
+import os
+import json
+import logging
+import importlib
+import hashlib
+import threading
+from pathlib import Path
+from collections import OrderedDict
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
-# Advanced exporters
-from .html_generator_advanced import AdvancedHTMLGenerator, export_advanced as export_html_advanced
-from .pdf_exporter_advanced import AdvancedPDFExporter, export_advanced as export_pdf_advanced
-from .multi_format_exporter import MultiFormatExporter, export_to_multiple_formats
+logger = logging.getLogger(__name__)
+
+# Exporters are imported on first access (PEP 562) so that importing this
+# package does not pull in WeasyPrint, ReportLab and Jinja2 up front
+_LAZY_ATTRS = {
+    # Legacy imports for backward compatibility
+    'export_html': ('.html_generator', 'export'),
+    'export_pdf': ('.pdf_exporter', 'export'),
+    
+    # Advanced exporters
+    'AdvancedHTMLGenerator': ('.html_generator_advanced', 'AdvancedHTMLGenerator'),
+    'export_html_advanced': ('.html_generator_advanced', 'export_advanced'),
+    'AdvancedPDFExporter': ('.pdf_exporter_advanced', 'AdvancedPDFExporter'),
+    'export_pdf_advanced': ('.pdf_exporter_advanced', 'export_advanced'),
+    'MultiFormatExporter': ('.multi_format_exporter', 'MultiFormatExporter'),
+    'export_to_multiple_formats': ('.multi_format_exporter', 'export_to_multiple_formats'),
+    'export_to_multiple_formats_streaming': ('.multi_format_exporter', 'export_to_multiple_formats_streaming')
+}
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attr = _LAZY_ATTRS[name]
+    value = getattr(importlib.import_module(module_name, __name__), attr)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
+
+# Shared exporter instances (Jinja2 environment, template lookup and PDF method
+# detection are set up once and reused by every convenience function)
+@lru_cache(maxsize=1)
+def _html_gen():
+    return __getattr__('AdvancedHTMLGenerator')()
+
+@lru_cache(maxsize=1)
+def _pdf_exp():
+    return __getattr__('AdvancedPDFExporter')()
+
+@lru_cache(maxsize=1)
+def _multi_exp():
+    return __getattr__('MultiFormatExporter')()
+
+# Rendered HTML keyed by (findings, config, template), so back-to-back report kinds
+# over the same findings render the Jinja2 template once. A hit reuses the whole
+# document, including the first render's report_id and generation time.
+_HTML_CACHE_SIZE = 8
+_html_cache = OrderedDict()
+_html_cache_lock = threading.Lock()
+
+def _html_cache_key(findings, config, template_name):
+    """Hash the inputs that determine the rendered HTML"""
+    h = hashlib.blake2b(digest_size=16)
+    for part in (findings, config, template_name):
+        h.update(json.dumps(part, sort_keys=True, default=str).encode('utf-8'))
+        h.update(b'\0')
+    return h.hexdigest()
+
+def _render_html(findings, output_path, config=None, template_name="industrial_report.html"):
+    """
+    Write the advanced HTML report to output_path, reusing a cached render when possible
+    
+    A cached copy keeps the report_id and generated date/time of the render it came
+    from, so reports of the same findings written in one run share that metadata.
+    """
+    key = _html_cache_key(findings, config, template_name)
+    with _html_cache_lock:
+        content = _html_cache.get(key)
+        if content is not None:
+            _html_cache.move_to_end(key)
+    
+    if content is not None:
+        Path(output_path).write_bytes(content)
+        # Same message and level as a fresh render from the generator
+        logger.info("[OK] Industrial HTML report generated: %s", output_path)
+        return str(output_path)
+    
+    html_path = _html_gen().export(findings, output_path, template_name=template_name, report_config=config)
+    content = Path(html_path).read_bytes()
+    with _html_cache_lock:
+        _html_cache[key] = content
+        while len(_html_cache) > _HTML_CACHE_SIZE:
+            _html_cache.popitem(last=False)
+    return html_path
+
+_EMPTY_REPORT_HTML = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <title>Cybersecurity Assessment Report</title>
+</head>
+<body>
+    <h1>Cybersecurity Assessment Report</h1>
+    <p>No findings were reported for this assessment.</p>
+</body>
+</html>
+"""
+
+def _empty_report_stubs(html_path):
+    """Write a minimal 'no findings' HTML report instead of running the full export pipeline"""
+    os.makedirs(os.path.dirname(html_path) or '.', exist_ok=True)
+    Path(html_path).write_text(_EMPTY_REPORT_HTML, encoding='utf-8')
+    print(f"[INFO] No findings to export, wrote stub report: {html_path}")
+    return [html_path]
+
+# Above these sizes WeasyPrint layout dominates PDF export time, so prefer wkhtmltopdf
+LARGE_REPORT_FINDINGS = 50
+LARGE_REPORT_HTML_BYTES = 1024 * 1024
+
+def _pdf_method_hint(findings, html_path):
+    """Suggest a faster PDF method for large reports"""
+    try:
+        html_size = os.path.getsize(html_path)
+    except OSError:
+        html_size = 0
+    if len(findings) > LARGE_REPORT_FINDINGS or html_size > LARGE_REPORT_HTML_BYTES:
+        return 'wkhtmltopdf'
+    return None
+
+def _export_formats(findings, base_path, formats, config=None):
+    """Run independent multi-format exports concurrently, keeping the formats order"""
+    multi_exporter = _multi_exp()
+    exported_files = []
+    
+    # Severity/category/host counts are shared by the JSON, XML and Markdown writers
+    stats = multi_exporter.precompute_stats(findings)
+    
+    with ThreadPoolExecutor(max_workers=len(formats)) as executor:
+        futures = []
+        for format_type in formats:
+            file_ext = 'xlsx' if format_type == 'excel' else format_type
+            output_path = f"{base_path}.{file_ext}"
+            futures.append((format_type, executor.submit(multi_exporter.export, findings, output_path, format_type, config, stats)))
+        
+        for format_type, future in futures:
+            try:
+                exported_files.append(future.result())
+            except Exception as e:
+                print(f"[WARNING] Failed to export {format_type}: {str(e)}")
+    
+    return exported_files
 
 # Convenience functions
 def export_all_formats(findings, base_path, config=None):
     """Export to all supported formats"""
+    if not findings:
+        return _empty_report_stubs(f"{base_path}.html")
+    
     exported_files = []
     
     try:
         # HTML Advanced
-        html_generator = AdvancedHTMLGenerator()
-        html_path = html_generator.export(findings, f"{base_path}.html", report_config=config)
+        html_path = _render_html(findings, f"{base_path}.html", config)
         exported_files.append(html_path)
         
         # PDF Advanced
-        pdf_exporter = AdvancedPDFExporter()
-        pdf_path = pdf_exporter.export(html_path, f"{base_path}.pdf", format_type='executive')
+        pdf_exporter = _pdf_exp()
+        pdf_path = pdf_exporter.export(
+            html_path, 
+            f"{base_path}.pdf", 
+            format_type='executive',
+            method_hint=_pdf_method_hint(findings, html_path)
+        )
         exported_files.append(pdf_path)
         
         # Multi-format exports
-        multi_exporter = MultiFormatExporter()
         formats = ['json', 'csv', 'xml', 'sarif', 'markdown']
-        
-        for format_type in formats:
-            try:
-                file_ext = 'xlsx' if format_type == 'excel' else format_type
-                output_path = f"{base_path}.{file_ext}"
-                exported_file = multi_exporter.export(findings, output_path, format_type, config)
-                exported_files.append(exported_file)
-            except Exception as e:
-                print(f"[WARNING] Failed to export {format_type}: {str(e)}")
+        exported_files.extend(_export_formats(findings, base_path, formats, config))
         
         return exported_files
     
@@ -59,39 +202,29 @@ def export_all_formats(findings, base_path, config=None):
 
 def export_compliance_pack(findings, base_path, config=None):
     """Export compliance-focused report pack"""
+    if not findings:
+        return _empty_report_stubs(f"{base_path}_compliance.html")
+    
     exported_files = []
     
     try:
         # HTML Professional Report
-        html_generator = AdvancedHTMLGenerator()
-        html_path = html_generator.export(
-            findings, 
-            f"{base_path}_compliance.html", 
-            report_config=config,
-            template_name="industrial_report.html"
-        )
+        html_path = _render_html(findings, f"{base_path}_compliance.html", config)
         exported_files.append(html_path)
         
         # PDF Compliance Format
-        pdf_exporter = AdvancedPDFExporter()
+        pdf_exporter = _pdf_exp()
         pdf_path = pdf_exporter.export(
             html_path, 
             f"{base_path}_compliance.pdf", 
-            format_type='compliance'
+            format_type='compliance',
+            method_hint=_pdf_method_hint(findings, html_path)
         )
         exported_files.append(pdf_path)
         
         # Compliance formats
-        multi_exporter = MultiFormatExporter()
         compliance_formats = ['sarif', 'stix', 'mitre', 'nist', 'junit']
-        
-        for format_type in compliance_formats:
-            try:
-                output_path = f"{base_path}_compliance.{format_type}"
-                exported_file = multi_exporter.export(findings, output_path, format_type, config)
-                exported_files.append(exported_file)
-            except Exception as e:
-                print(f"[WARNING] Failed to export {format_type}: {str(e)}")
+        exported_files.extend(_export_formats(findings, f"{base_path}_compliance", compliance_formats, config))
         
         return exported_files
     
@@ -101,24 +234,21 @@ def export_compliance_pack(findings, base_path, config=None):
 
 def export_executive_summary(findings, base_path, config=None):
     """Export executive-focused summary"""
+    if not findings:
+        return _empty_report_stubs(f"{base_path}_executive.html")
+    
     try:
         # Executive HTML
-        html_generator = AdvancedHTMLGenerator()
-        html_path = html_generator.export(
-            findings, 
-            f"{base_path}_executive.html", 
-            report_config=config,
-            executive_dashboard=True,
-            charts=True
-        )
+        html_path = _render_html(findings, f"{base_path}_executive.html", config)
         
         # Executive PDF
-        pdf_exporter = AdvancedPDFExporter()
+        pdf_exporter = _pdf_exp()
         pdf_path = pdf_exporter.export(
             html_path, 
             f"{base_path}_executive.pdf", 
             format_type='executive',
-            include_charts=True
+            include_charts=True,
+            method_hint=_pdf_method_hint(findings, html_path)
         )
         
         return [html_path, pdf_path]
@@ -129,26 +259,24 @@ def export_executive_summary(findings, base_path, config=None):
 
 def export_technical_report(findings, base_path, config=None):
     """Export technical-focused report"""
+    if not findings:
+        return _empty_report_stubs(f"{base_path}_technical.html")
+    
     try:
         # Technical HTML
-        html_generator = AdvancedHTMLGenerator()
-        html_path = html_generator.export(
-            findings, 
-            f"{base_path}_technical.html", 
-            report_config=config,
-            template_name="industrial_report.html"
-        )
+        html_path = _render_html(findings, f"{base_path}_technical.html", config)
         
         # Technical PDF
-        pdf_exporter = AdvancedPDFExporter()
+        pdf_exporter = _pdf_exp()
         pdf_path = pdf_exporter.export(
             html_path, 
             f"{base_path}_technical.pdf", 
-            format_type='technical'
+            format_type='technical',
+            method_hint=_pdf_method_hint(findings, html_path)
         )
         
         # Technical formats
-        multi_exporter = MultiFormatExporter()
+        multi_exporter = _multi_exp()
         json_path = multi_exporter.export(findings, f"{base_path}_technical.json", "json", config)
         csv_path = multi_exporter.export(findings, f"{base_path}_technical.csv", "csv", config)
         
@@ -158,11 +286,17 @@ def export_technical_report(findings, base_path, config=None):
         print(f"[ERROR] Failed to export technical report: {str(e)}")
         return []
 
+@lru_cache(maxsize=1)
 def get_export_info():
-    """Get information about available export formats and methods"""
-    html_generator = AdvancedHTMLGenerator()
-    pdf_exporter = AdvancedPDFExporter()
-    multi_exporter = MultiFormatExporter()
+    """
+    Get information about available export formats and methods
+    
+    The result is cached because PDF method detection probes external tools;
+    call get_export_info.cache_clear() after installing a PDF backend.
+    """
+    html_generator = _html_gen()
+    pdf_exporter = _pdf_exp()
+    multi_exporter = _multi_exp()
     
     return {
         'html_templates': ['industrial_report.html', 'default.html.j2'],
@@ -184,5 +318,6 @@ __all__ = [
     # Convenience functions
     'export_all_formats', 'export_compliance_pack', 
     'export_executive_summary', 'export_technical_report',
-    'export_to_multiple_formats', 'get_export_info'
+    'export_to_multiple_formats', 'export_to_multiple_formats_streaming',
+    'get_export_info'
 ]
@@ -4,12 +4,63 @@ Converts findings to HTML reports using Jinja2 templates
 """
 
 import os
+import logging
+from collections import Counter, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from jinja2 import Environment, FileSystemLoader, Template
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
+from markupsafe import Markup, escape
 from ai.summarizer import generate_executive_summary
 from ai.severity_classifier import sort_by_severity
 
+logger = logging.getLogger(__name__)
+
+# Buffer size for writing generated reports
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Severity buckets counted in report statistics (others are only in the total)
+_SEV_KEYS = ('critical', 'high', 'medium', 'low')
+
+# Compiled templates are also kept on disk so new processes skip parsing them
+BYTECODE_CACHE_DIR = Path.home() / ".cache" / "cybersec-ai" / "jinja"
+
+def _bytecode_cache():
+    """Create the on-disk template bytecode cache, or None if its directory is unusable"""
+    try:
+        BYTECODE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        return FileSystemBytecodeCache(str(BYTECODE_CACHE_DIR), '%s.cache')
+    except OSError as e:
+        logger.warning("[WARNING] Template bytecode cache unavailable: %s", e)
+        return None
+
+# Shared environment so compiled templates are reused across export() calls
+_ENV = Environment(
+    loader=FileSystemLoader(str(Path(__file__).parent.parent / "templates")),
+    bytecode_cache=_bytecode_cache(),
+    autoescape=True,
+    auto_reload=False,
+    cache_size=50
+)
+
+@lru_cache(maxsize=None)
+def _get_template(template_name):
+    """Load and compile a template once, falling back to the inline default template"""
+    try:
+        return _ENV.get_template(template_name)
+    except Exception:
+        # Fallback to inline template if file not found
+        return _DEFAULT_TEMPLATE
+
+REPORTS_DIR = "reports"
+
+@lru_cache(maxsize=1)
+def _reports_dir():
+    """Ensure the default reports directory exists (checked once per process)"""
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+    return REPORTS_DIR
+
 def export(findings, output_path=None, template_name="default.html.j2"):
     """
     Export findings to HTML report
@@ -23,104 +74,141 @@ def export(findings, output_path=None, template_name="default.html.j2"):
         str: Path to generated HTML file
     """
     try:
-        # Ensure reports directory exists
-        reports_dir = "reports"
-        os.makedirs(reports_dir, exist_ok=True)
+        # One timestamp for the file name and the report header
+        now = datetime.now()
         
         # Generate output path if not provided
         if not output_path:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_path = os.path.join(reports_dir, f"cybersec_report_{timestamp}.html")
+            timestamp = now.strftime("%Y%m%d_%H%M%S")
+            output_path = os.path.join(_reports_dir(), f"cybersec_report_{timestamp}.html")
         
         # Load template
-        template_path = Path(__file__).parent.parent / "templates"
-        env = Environment(loader=FileSystemLoader(str(template_path)))
-        
-        try:
-            template = env.get_template(template_name)
-        except:
-            # Fallback to inline template if file not found
-            template = Template(get_default_template())
+        template = _get_template(template_name)
         
         # Sort findings by severity
         sorted_findings = sort_by_severity(findings)
         
-        # Generate statistics
-        stats = generate_statistics(sorted_findings)
-        
-        # Generate executive summary
-        exec_summary = generate_executive_summary(sorted_findings)
+        # Generate executive summary (may wait on the AI) while rows and statistics are built
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            summary_future = executor.submit(generate_executive_summary, sorted_findings)
+            
+            # Template rows and statistics
+            rows, stats = build_rows_and_statistics(sorted_findings)
+            
+            exec_summary = summary_future.result()
         
-        # Render template
-        html_content = template.render(
+        # Render template straight into the HTML file instead of building the whole report in memory
+        stream = template.stream(
             report_title="Cybersecurity Assessment Report",
             company_name="Security Assessment",
-            generated_date=datetime.now().strftime("%B %d, %Y"),
-            generated_time=datetime.now().strftime("%H:%M:%S"),
+            generated_date=now.strftime("%B %d, %Y"),
+            generated_time=now.strftime("%H:%M:%S"),
             findings=sorted_findings,
+            rows=rows,
             statistics=stats,
             executive_summary=exec_summary,
             total_findings=len(sorted_findings)
         )
+        stream.enable_buffering(size=64)
+        with open(output_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            stream.dump(f, encoding='utf-8')
         
-        # Write HTML file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        
-        print(f"[OK] HTML report generated: {output_path}")
+        logger.info("[OK] HTML report generated: %s", output_path)
         return output_path
     
     except Exception as e:
-        print(f"[ERROR] Failed to generate HTML report: {str(e)}")
+        logger.error("[ERROR] Failed to generate HTML report: %s", e)
         raise
 
-def generate_statistics(findings):
-    """Generate statistics from findings"""
-    stats = {
-        'total': len(findings),
-        'critical': 0,
-        'high': 0,
-        'medium': 0,
-        'low': 0,
-        'categories': {},
-        'sources': {}
-    }
+# One finding as the default template renders it; optional sections are pre-rendered HTML.
+# Values are escaped once here and marked safe, so autoescape does not redo the work per render.
+ReportRow = namedtuple('ReportRow', ['title', 'sev_class', 'severity', 'description', 'sections'])
+
+_SECTION_HTML = Markup("""
+                    <div class="finding-section">
+                        <h4>{heading}</h4>
+                        <p>{body}</p>
+                    </div>""")
+
+_REMEDIATION_HTML = Markup("""
+                    <div class="finding-section">
+                        <h4>Remediation</h4>
+                        <div class="remediation">
+                            <p style="white-space: pre-line;">{body}</p>
+                        </div>
+                    </div>""")
+
+def build_rows_and_statistics(findings):
+    """
+    Build template rows and report statistics
     
+    Rows are flattened so the render loop has no per-row conditionals; the
+    statistics come from generate_statistics.
+    
+    Args:
+        findings (list): Sorted list of findings
+        
+    Returns:
+        tuple: (list of ReportRow, statistics dict)
+    """
+    rows = []
     for finding in findings:
-        # Count by severity
-        severity = finding.get('severity', 'Medium').lower()
-        if severity == 'critical':
-            stats['critical'] += 1
-        elif severity == 'high':
-            stats['high'] += 1
-        elif severity == 'medium':
-            stats['medium'] += 1
-        elif severity == 'low':
-            stats['low'] += 1
+        sev_class = finding.get('severity', 'Medium').lower()
         
-        # Count by category
-        category = finding.get('category', 'other')
-        stats['categories'][category] = stats['categories'].get(category, 0) + 1
+        sections = []
+        target = finding.get('host') or finding.get('url')
+        for heading, body in (
+            ('Impact', finding.get('impact')),
+            ('Target', target),
+            ('Evidence', finding.get('evidence')),
+            ('AI Analysis', finding.get('ai_summary'))
+        ):
+            if body:
+                sections.append(_SECTION_HTML.format(heading=heading, body=body))
+        if finding.get('remediation'):
+            sections.append(_REMEDIATION_HTML.format(body=finding['remediation']))
         
-        # Count by source
-        source = finding.get('source', 'unknown')
-        stats['sources'][source] = stats['sources'].get(source, 0) + 1
+        rows.append(ReportRow(
+            escape(finding.get('title', '')),
+            escape(sev_class),
+            escape(finding.get('severity', '')),
+            escape(finding.get('description', '')),
+            Markup('').join(sections)
+        ))
     
+    return rows, generate_statistics(findings)
+
+def generate_statistics(findings):
+    """Generate statistics from findings"""
+    severities = Counter(finding.get('severity', 'Medium').lower() for finding in findings)
+    categories = Counter(finding.get('category', 'other') for finding in findings)
+    sources = Counter(finding.get('source', 'unknown') for finding in findings)
+    
+    stats = {'total': len(findings)}
+    for key in _SEV_KEYS:
+        stats[key] = severities[key]
+    stats['categories'] = dict(categories)
+    stats['sources'] = dict(sources)
     return stats
 
+# CSS color class per severity
+_SEV_COLOR = {
+    'Critical': 'danger',
+    'High': 'warning',
+    'Medium': 'info',
+    'Low': 'success'
+}
+
 def get_severity_color(severity):
     """Get CSS color class for severity"""
-    colors = {
-        'Critical': 'danger',
-        'High': 'warning', 
-        'Medium': 'info',
-        'Low': 'success'
-    }
-    return colors.get(severity, 'secondary')
+    return _SEV_COLOR.get(severity, 'secondary')
 
 def get_default_template():
     """Default HTML template if external template file is not available"""
-    return """<!DOCTYPE html>
+    return _DEFAULT_TEMPLATE_SRC
+
+# Default HTML template source, compiled once into _DEFAULT_TEMPLATE below
+_DEFAULT_TEMPLATE_SRC = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -310,54 +398,18 @@ def get_default_template():
 
         <div class="findings">
             <h2>[FINDINGS] Detailed Findings</h2>
-            {% for finding in findings %}
+            {% for row in rows %}
             <div class="finding">
                 <div class="finding-header">
-                    <h3 class="finding-title">{{ finding.title }}</h3>
-                    <span class="severity {{ finding.severity|lower }}">{{ finding.severity }}</span>
+                    <h3 class="finding-title">{{ row.title }}</h3>
+                    <span class="severity {{ row.sev_class }}">{{ row.severity }}</span>
                 </div>
                 <div class="finding-content">
                     <div class="finding-section">
                         <h4>Description</h4>
-                        <p>{{ finding.description }}</p>
-                    </div>
-                    
-                    {% if finding.impact %}
-                    <div class="finding-section">
-                        <h4>Impact</h4>
-                        <p>{{ finding.impact }}</p>
+                        <p>{{ row.description }}</p>
                     </div>
-                    {% endif %}
-                    
-                    {% if finding.host or finding.url %}
-                    <div class="finding-section">
-                        <h4>Target</h4>
-                        <p>{{ finding.host or finding.url }}</p>
-                    </div>
-                    {% endif %}
-                    
-                    {% if finding.evidence %}
-                    <div class="finding-section">
-                        <h4>Evidence</h4>
-                        <p>{{ finding.evidence }}</p>
-                    </div>
-                    {% endif %}
-                    
-                    {% if finding.ai_summary %}
-                    <div class="finding-section">
-                        <h4>AI Analysis</h4>
-                        <p>{{ finding.ai_summary }}</p>
-                    </div>
-                    {% endif %}
-                    
-                    {% if finding.remediation %}
-                    <div class="finding-section">
-                        <h4>Remediation</h4>
-                        <div class="remediation">
-                            <p style="white-space: pre-line;">{{ finding.remediation }}</p>
-                        </div>
-                    </div>
-                    {% endif %}
+                    {{ row.sections }}
                 </div>
             </div>
             {% endfor %}
@@ -369,3 +421,5 @@ def get_default_template():
     </div>
 </body>
 </html>"""
+
+_DEFAULT_TEMPLATE = _ENV.from_string(_DEFAULT_TEMPLATE_SRC)
@@ -5,13 +5,208 @@ Enhanced cybersecurity reporting with professional templates and multiple export
 
 import os
 import json
+import logging
 import base64
+from bisect import bisect_left, bisect_right
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from jinja2 import Environment, FileSystemLoader, Template
+from types import MappingProxyType
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, Template
 from ai.summarizer import generate_executive_summary
-from ai.severity_classifier import sort_by_severity
 import uuid
+from collections import Counter, namedtuple
+
+logger = logging.getLogger(__name__)
+
+# Buffer size for writing generated reports
+WRITE_BUFFER_SIZE = 1 << 20
+
+# On-disk bytecode cache for compiled templates. Kept apart from the basic
+# generator's cache because this environment compiles with different options.
+BYTECODE_CACHE_DIR = Path.home() / ".cache" / "cybersec-ai" / "jinja-advanced"
+
+def _bytecode_cache():
+    """Create the on-disk template bytecode cache, or None if its directory is unusable"""
+    try:
+        BYTECODE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        return FileSystemBytecodeCache(str(BYTECODE_CACHE_DIR), '%s.cache')
+    except OSError as e:
+        logger.warning("[WARNING] Template bytecode cache unavailable: %s", e)
+        return None
+
+# CVSS buckets: statistics use inclusive upper bounds (<= 3, <= 6, <= 8),
+# charts use exclusive ones (< 4, < 7, < 9)
+_CVSS_EDGES = (3, 6, 8)
+_CVSS_KEYS = ('0-3', '4-6', '7-8', '9-10')
+_CHART_CVSS_EDGES = (4, 7, 9)
+
+# Severity code stored on processed findings, also its position in the
+# severity chart; anything unrecognised is coded (and charted) as info
+_SEV_CODE = {'critical': 0, 'high': 1, 'medium': 2, 'low': 3, 'info': 4}
+_SEV_CODE_INFO = 4
+
+_SEVERITY_COLORS = {
+    'critical': '#dc3545',
+    'high': '#fd7e14',
+    'medium': '#ffc107',
+    'low': '#28a745',
+    'info': '#17a2b8'
+}
+
+_SEVERITY_ICONS = {
+    'critical': '🔴',
+    'high': '🟠',
+    'medium': '🟡',
+    'low': '🟢',
+    'info': '🔵'
+}
+
+# Simplified CVSS score per severity
+_SEVERITY_SCORES = {
+    'critical': 9.5,
+    'high': 7.5,
+    'medium': 5.0,
+    'low': 2.5,
+    'info': 0.0
+}
+
+# Recommendations included in every report, after the severity-driven ones
+_STATIC_RECOMMENDATIONS = (
+    MappingProxyType({
+        'priority': 'Medium',
+        'category': 'Security Controls',
+        'description': 'Implement comprehensive security monitoring and alerting',
+        'timeline': '2-4 weeks',
+        'effort': 'Medium',
+        'impact': 'Medium'
+    }),
+    MappingProxyType({
+        'priority': 'Medium',
+        'category': 'Process Improvement',
+        'description': 'Establish regular security assessments and vulnerability management',
+        'timeline': '1-3 months',
+        'effort': 'Medium',
+        'impact': 'Medium'
+    }),
+    MappingProxyType({
+        'priority': 'Low',
+        'category': 'Training & Awareness',
+        'description': 'Conduct security awareness training for all personnel',
+        'timeline': '3-6 months',
+        'effort': 'Low',
+        'impact': 'Medium'
+    })
+)
+
+# Next steps (numbered when generated); the emergency step leads when there are critical findings
+_EMERGENCY_RESPONSE_STEP = MappingProxyType({
+    'action': 'Emergency Response',
+    'description': 'Initiate incident response procedures for critical vulnerabilities',
+    'owner': 'Security Team',
+    'deadline': '24 hours'
+})
+
+_STATIC_NEXT_STEPS = (
+    MappingProxyType({
+        'action': 'Vulnerability Prioritization',
+        'description': 'Prioritize vulnerabilities based on risk matrix and business impact',
+        'owner': 'Security Team',
+        'deadline': '48 hours'
+    }),
+    MappingProxyType({
+        'action': 'Remediation Planning',
+        'description': 'Create detailed remediation plans for each vulnerability',
+        'owner': 'IT/Security Teams',
+        'deadline': '1 week'
+    }),
+    MappingProxyType({
+        'action': 'Implementation',
+        'description': 'Execute remediation plans according to priority',
+        'owner': 'IT Teams',
+        'deadline': '4 weeks'
+    }),
+    MappingProxyType({
+        'action': 'Validation',
+        'description': 'Verify that vulnerabilities have been properly addressed',
+        'owner': 'Security Team',
+        'deadline': '6 weeks'
+    })
+)
+
+# Defaults filled into every processed finding (discovery_date and last_seen
+# default to the processing time). The empty collections only reserve the key's
+# position: missing ones are replaced per finding (see _FINDING_COLLECTIONS).
+_FINDING_DEFAULTS = MappingProxyType({
+    'title': 'Unknown Vulnerability',
+    'description': 'No description available',
+    'severity': 'Medium',
+    'category': 'Security',
+    'subcategory': 'General',
+    'host': 'Unknown',
+    'port': 'N/A',
+    'service': 'Unknown',
+    'protocol': 'Unknown',
+    'evidence': 'No evidence provided',
+    'impact': 'Impact assessment not available',
+    'remediation': 'No remediation available',
+    'references': [],
+    'tags': [],
+    'ai_summary': '',
+    'ai_risk_assessment': '',
+    'source': 'Unknown',
+    'confidence': 'Medium',
+    'exploitability': 'Unknown',
+    'assets_affected': [],
+    'business_impact': 'Unknown',
+    'compliance_impact': [],
+    'technical_details': {},
+    'screenshots': [],
+    'attachments': []
+})
+
+# Collection fields given a fresh object per finding, so callers can append to them
+_FINDING_COLLECTIONS = (
+    ('references', list), ('tags', list), ('assets_affected', list), ('compliance_impact', list),
+    ('technical_details', dict), ('screenshots', list), ('attachments', list)
+)
+
+# Struct-of-arrays view of the finding fields the statistics are built from
+# (severity is lowercased)
+_FindingColumns = namedtuple('_FindingColumns', [
+    'severity', 'cvss_score', 'category', 'host', 'service', 'source',
+    'confidence', 'exploitability', 'business_impact', 'compliance_impact'
+])
+
+def _columns_from_findings(findings):
+    """Extract statistics columns from findings, using the defaults the statistics always assumed"""
+    return _FindingColumns(
+        [f.get('severity', 'medium').lower() for f in findings],
+        [f.get('cvss_score', 0) for f in findings],
+        [f.get('category', 'Other') for f in findings],
+        [f.get('host', 'Unknown') for f in findings],
+        [f.get('service', 'Unknown') for f in findings],
+        [f.get('source', 'Unknown') for f in findings],
+        [f.get('confidence', 'Medium') for f in findings],
+        [f.get('exploitability', 'Unknown') for f in findings],
+        [f.get('business_impact', 'Unknown') for f in findings],
+        [f.get('compliance_impact', []) for f in findings]
+    )
+
+@lru_cache(maxsize=16)
+def _severity_color(severity):
+    """Color for a severity level"""
+    return _SEVERITY_COLORS.get(severity.lower(), '#6c757d')
+
+@lru_cache(maxsize=16)
+def _severity_icon(severity):
+    """Icon for a severity level"""
+    return _SEVERITY_ICONS.get(severity.lower(), '⚪')
+
+@lru_cache(maxsize=16)
+def _severity_score(severity):
+    """Simplified CVSS score for a severity level"""
+    return _SEVERITY_SCORES.get(severity.lower(), 5.0)
 
 class AdvancedHTMLGenerator:
     """Advanced HTML report generator with industrial-level formatting"""
@@ -23,10 +218,16 @@ class AdvancedHTMLGenerator:
         # Initialize Jinja2 environment
         self.env = Environment(
             loader=FileSystemLoader(str(self.template_dir)),
+            bytecode_cache=_bytecode_cache(),
             trim_blocks=True,
-            lstrip_blocks=True
+            lstrip_blocks=True,
+            auto_reload=False,
+            cache_size=-1
         )
         
+        # Compiled templates reused across export() calls
+        self._template_cache = {}
+        
         # Register custom filters
         self.env.filters['severity_color'] = self.get_severity_color
         self.env.filters['severity_icon'] = self.get_severity_icon
@@ -65,82 +266,110 @@ class AdvancedHTMLGenerator:
                 output_path = reports_dir / f"cybersec_report_{timestamp}.html"
             
             # Process findings
-            processed_findings = self.process_findings(findings)
+            processed_findings, columns = self._process_findings(findings)
+            
+            # Aggregate statistics, charts, risk matrix and compliance from the columns
+            aggregate = self._aggregate(processed_findings, columns)
             
             # Generate report data
-            report_data = self.generate_report_data(processed_findings, report_config)
+            report_data = self.generate_report_data(processed_findings, report_config, aggregate)
             
             # Generate charts if requested
             if charts:
-                report_data['charts'] = self.generate_charts_data(processed_findings)
-            
-            # Create template if it doesn't exist
-            template_path = self.template_dir / template_name
-            if not template_path.exists():
-                self.create_industrial_template(template_path)
+                report_data['charts'] = aggregate['charts']
             
-            # Load and render template
-            template = self.env.get_template(template_name)
-            html_content = template.render(**report_data)
+            # Load template and stream it straight into the output file
+            template = self._get_template(template_name)
+            stream = template.stream(**report_data)
+            stream.enable_buffering(size=64)
+            with open(output_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+                stream.dump(f, encoding='utf-8')
             
-            # Write HTML file
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            
-            print(f"[OK] Industrial HTML report generated: {output_path}")
+            logger.info("[OK] Industrial HTML report generated: %s", output_path)
             return str(output_path)
             
         except Exception as e:
-            print(f"[ERROR] Failed to generate advanced HTML report: {str(e)}")
+            logger.error("[ERROR] Failed to generate advanced HTML report: %s", e)
             raise
     
+    def _get_template(self, template_name):
+        """Load a template once per generator, creating the industrial template if missing"""
+        template = self._template_cache.get(template_name)
+        if template is None:
+            template_path = self.template_dir / template_name
+            if not template_path.exists():
+                self.create_industrial_template(template_path)
+            template = self._template_cache[template_name] = self.env.get_template(template_name)
+        return template
+    
     def process_findings(self, findings):
         """Process and enhance findings with additional metadata"""
+        return self._process_findings(findings)[0]
+    
+    def _process_findings(self, findings):
+        """
+        Process findings in severity order, collecting statistics columns on the way
+        
+        Args:
+            findings (list): Raw findings
+        
+        Returns:
+            tuple: (processed findings sorted by severity, _FindingColumns)
+        """
         processed = []
+        columns = _FindingColumns(*([] for _ in _FindingColumns._fields))
+        (add_severity, add_cvss, add_category, add_host, add_service, add_source,
+         add_confidence, add_exploitability, add_business_impact, add_compliance) = (
+            column.append for column in columns
+        )
+        
+        # One timestamp for every missing discovery/last-seen date
+        now_iso = datetime.now().isoformat()
+        defaults = dict(_FINDING_DEFAULTS, discovery_date=now_iso, last_seen=now_iso)
         
+        # Order the raw findings by severity code (critical first) with a stable
+        # bucket pass, so the columns line up with the returned findings
+        by_code = tuple([] for _ in range(_SEV_CODE_INFO + 1))
         for finding in findings:
-            # Create enhanced finding object
-            enhanced_finding = {
-                'id': str(uuid.uuid4()),
-                'title': finding.get('title', 'Unknown Vulnerability'),
-                'description': finding.get('description', 'No description available'),
-                'severity': finding.get('severity', 'Medium'),
-                'cvss_score': self.calculate_cvss_score(finding),
-                'category': finding.get('category', 'Security'),
-                'subcategory': finding.get('subcategory', 'General'),
-                'host': finding.get('host', 'Unknown'),
-                'port': finding.get('port', 'N/A'),
-                'service': finding.get('service', 'Unknown'),
-                'protocol': finding.get('protocol', 'Unknown'),
-                'evidence': finding.get('evidence', 'No evidence provided'),
-                'impact': finding.get('impact', 'Impact assessment not available'),
-                'remediation': finding.get('remediation', 'No remediation available'),
-                'references': finding.get('references', []),
-                'tags': finding.get('tags', []),
-                'ai_summary': finding.get('ai_summary', ''),
-                'ai_risk_assessment': finding.get('ai_risk_assessment', ''),
-                'discovery_date': finding.get('discovery_date', datetime.now().isoformat()),
-                'last_seen': finding.get('last_seen', datetime.now().isoformat()),
-                'source': finding.get('source', 'Unknown'),
-                'confidence': finding.get('confidence', 'Medium'),
-                'exploitability': finding.get('exploitability', 'Unknown'),
-                'assets_affected': finding.get('assets_affected', []),
-                'business_impact': finding.get('business_impact', 'Unknown'),
-                'compliance_impact': finding.get('compliance_impact', []),
-                'technical_details': finding.get('technical_details', {}),
-                'screenshots': finding.get('screenshots', []),
-                'attachments': finding.get('attachments', [])
-            }
+            by_code[_SEV_CODE.get(finding.get('severity', 'Medium').lower(), _SEV_CODE_INFO)].append(finding)
+        ordered = [finding for bucket in by_code for finding in bucket]
+        
+        # 128 random bits per finding id, read from the OS in one call
+        id_hex = os.urandom(16 * len(ordered)).hex()
+        
+        for i, finding in enumerate(ordered):
+            # Create enhanced finding object: the finding's own fields over the defaults
+            enhanced_finding = {**defaults, **finding}
+            for field, factory in _FINDING_COLLECTIONS:
+                if field not in finding:
+                    enhanced_finding[field] = factory()
+            enhanced_finding['id'] = id_hex[32 * i:32 * i + 32]
+            
+            # Normalized severity for statistics, plus its code
+            severity = enhanced_finding['severity'].lower()
+            enhanced_finding['_sev_code'] = _SEV_CODE.get(severity, _SEV_CODE_INFO)
+            enhanced_finding['cvss_score'] = _severity_score(severity)
             
             processed.append(enhanced_finding)
-        
-        return sort_by_severity(processed)
+            add_severity(severity)
+            add_cvss(enhanced_finding['cvss_score'])
+            add_category(enhanced_finding['category'])
+            add_host(enhanced_finding['host'])
+            add_service(enhanced_finding['service'])
+            add_source(enhanced_finding['source'])
+            add_confidence(enhanced_finding['confidence'])
+            add_exploitability(enhanced_finding['exploitability'])
+            add_business_impact(enhanced_finding['business_impact'])
+            add_compliance(enhanced_finding['compliance_impact'])
+        
+        return processed, columns
     
-    def generate_report_data(self, findings, config):
+    def generate_report_data(self, findings, config, aggregate=None):
         """Generate comprehensive report data"""
-        stats = self.generate_advanced_statistics(findings)
-        risk_matrix = self.generate_risk_matrix(findings)
-        compliance_summary = self.generate_compliance_summary(findings)
+        if aggregate is None:
+            aggregate = self._aggregate(findings)
+        stats = aggregate['statistics']
+        now = datetime.now()
         
         return {
             'report_id': str(uuid.uuid4()),
@@ -151,136 +380,157 @@ class AdvancedHTMLGenerator:
             'assessment_methodology': config.get('methodology', 'Automated Security Assessment'),
             'report_version': config.get('version', '1.0'),
             'classification': config.get('classification', 'CONFIDENTIAL'),
-            'generated_date': datetime.now().strftime("%B %d, %Y"),
-            'generated_time': datetime.now().strftime("%H:%M:%S UTC"),
+            'generated_date': now.strftime("%B %d, %Y"),
+            'generated_time': now.strftime("%H:%M:%S UTC"),
             'generated_by': config.get('generated_by', 'CyberSec-AI AutoReport'),
             'findings': findings,
             'statistics': stats,
-            'risk_matrix': risk_matrix,
-            'compliance_summary': compliance_summary,
+            'risk_matrix': aggregate['risk_matrix'],
+            'compliance_summary': aggregate['compliance_summary'],
             'executive_summary': generate_executive_summary(findings),
-            'recommendations': self.generate_recommendations(findings),
+            'recommendations': self.generate_recommendations(findings, stats),
             'next_steps': self.generate_next_steps(findings, stats),
             'total_findings': len(findings),
             'report_config': config
         }
     
-    def generate_advanced_statistics(self, findings):
-        """Generate comprehensive statistics"""
+    def _aggregate(self, findings, columns=None):
+        """
+        Build statistics, chart data, risk matrix and compliance summary
+        
+        Args:
+            findings (list): Processed findings
+            columns (_FindingColumns): Statistics columns for findings (extracted if omitted)
+        
+        Returns:
+            dict: 'statistics', 'charts', 'risk_matrix' and 'compliance_summary'
+        """
+        if columns is None:
+            columns = _columns_from_findings(findings)
+        
         stats = {
             'total': len(findings),
             'by_severity': {'critical': 0, 'high': 0, 'medium': 0, 'low': 0, 'info': 0},
-            'by_category': {},
-            'by_confidence': {},
-            'by_exploitability': {},
-            'by_source': {},
-            'by_host': {},
-            'by_service': {},
+            'by_category': dict(Counter(columns.category)),
+            'by_confidence': dict(Counter(columns.confidence)),
+            'by_exploitability': dict(Counter(columns.exploitability)),
+            'by_source': dict(Counter(columns.source)),
+            'by_host': dict(Counter(columns.host)),
+            'by_service': dict(Counter(columns.service)),
             'cvss_distribution': {'0-3': 0, '4-6': 0, '7-8': 0, '9-10': 0},
             'trend_analysis': {},
             'compliance_violations': {},
             'remediation_effort': {'quick': 0, 'medium': 0, 'complex': 0},
             'business_impact': {'high': 0, 'medium': 0, 'low': 0}
         }
-        
-        for finding in findings:
-            # Severity distribution
-            severity = finding.get('severity', 'medium').lower()
-            stats['by_severity'][severity] = stats['by_severity'].get(severity, 0) + 1
-            
-            # Category distribution
-            category = finding.get('category', 'Other')
-            stats['by_category'][category] = stats['by_category'].get(category, 0) + 1
-            
-            # Confidence distribution
-            confidence = finding.get('confidence', 'Medium')
-            stats['by_confidence'][confidence] = stats['by_confidence'].get(confidence, 0) + 1
-            
-            # Exploitability distribution
-            exploitability = finding.get('exploitability', 'Unknown')
-            stats['by_exploitability'][exploitability] = stats['by_exploitability'].get(exploitability, 0) + 1
-            
-            # Source distribution
-            source = finding.get('source', 'Unknown')
-            stats['by_source'][source] = stats['by_source'].get(source, 0) + 1
-            
-            # Host distribution
-            host = finding.get('host', 'Unknown')
-            stats['by_host'][host] = stats['by_host'].get(host, 0) + 1
-            
-            # Service distribution
-            service = finding.get('service', 'Unknown')
-            stats['by_service'][service] = stats['by_service'].get(service, 0) + 1
-            
-            # CVSS distribution
-            cvss = finding.get('cvss_score', 0)
-            if cvss <= 3:
-                stats['cvss_distribution']['0-3'] += 1
-            elif cvss <= 6:
-                stats['cvss_distribution']['4-6'] += 1
-            elif cvss <= 8:
-                stats['cvss_distribution']['7-8'] += 1
-            else:
-                stats['cvss_distribution']['9-10'] += 1
-        
-        return stats
-    
-    def generate_risk_matrix(self, findings):
-        """Generate risk matrix data"""
         matrix = {
             'high_likelihood': {'high_impact': [], 'medium_impact': [], 'low_impact': []},
             'medium_likelihood': {'high_impact': [], 'medium_impact': [], 'low_impact': []},
             'low_likelihood': {'high_impact': [], 'medium_impact': [], 'low_impact': []}
         }
+        frameworks = {
+            'OWASP': {'total': 0, 'violations': []},
+            'NIST': {'total': 0, 'violations': []},
+            'PCI-DSS': {'total': 0, 'violations': []},
+            'ISO-27001': {'total': 0, 'violations': []},
+            'GDPR': {'total': 0, 'violations': []},
+            'SOX': {'total': 0, 'violations': []},
+            'HIPAA': {'total': 0, 'violations': []}
+        }
         
-        for finding in findings:
-            exploitability = finding.get('exploitability', 'Unknown').lower()
-            business_impact = finding.get('business_impact', 'Unknown').lower()
-            
+        # Severity distribution and chart (anything unrecognised charts as info)
+        by_severity = stats['by_severity']
+        severity_data = [0, 0, 0, 0, 0]
+        for sev, count in Counter(columns.severity).items():
+            by_severity[sev] = by_severity.get(sev, 0) + count
+            severity_data[_SEV_CODE.get(sev, _SEV_CODE_INFO)] += count
+        
+        # CVSS distributions, bucketed once per distinct score
+        cvss_distribution = stats['cvss_distribution']
+        chart_cvss_data = [0, 0, 0, 0]
+        for cvss, count in Counter(columns.cvss_score).items():
+            cvss_distribution[_CVSS_KEYS[bisect_left(_CVSS_EDGES, cvss)]] += count
+            chart_cvss_data[bisect_right(_CHART_CVSS_EDGES, cvss)] += count
+        
+        # Risk matrix
+        for finding, expl, bimp in zip(findings, columns.exploitability, columns.business_impact):
+            expl = expl.lower()
             likelihood = 'medium_likelihood'
-            if exploitability in ['easy', 'high']:
+            if expl in ['easy', 'high']:
                 likelihood = 'high_likelihood'
-            elif exploitability in ['difficult', 'low']:
+            elif expl in ['difficult', 'low']:
                 likelihood = 'low_likelihood'
             
+            bimp = bimp.lower()
             impact = 'medium_impact'
-            if business_impact in ['high', 'critical']:
+            if bimp in ['high', 'critical']:
                 impact = 'high_impact'
-            elif business_impact in ['low', 'minimal']:
+            elif bimp in ['low', 'minimal']:
                 impact = 'low_impact'
             
             matrix[likelihood][impact].append(finding)
         
-        return matrix
-    
-    def generate_compliance_summary(self, findings):
-        """Generate compliance framework summary"""
-        frameworks = {
-            'OWASP': {'total': 0, 'violations': []},
-            'NIST': {'total': 0, 'violations': []},
-            'PCI-DSS': {'total': 0, 'violations': []},
-            'ISO-27001': {'total': 0, 'violations': []},
-            'GDPR': {'total': 0, 'violations': []},
-            'SOX': {'total': 0, 'violations': []},
-            'HIPAA': {'total': 0, 'violations': []}
-        }
-        
-        for finding in findings:
-            compliance_impacts = finding.get('compliance_impact', [])
+        # Compliance frameworks
+        for finding, compliance_impacts in zip(findings, columns.compliance_impact):
             for framework in compliance_impacts:
                 if framework in frameworks:
                     frameworks[framework]['total'] += 1
                     frameworks[framework]['violations'].append(finding)
         
-        return frameworks
+        # Generate colors for categories
+        categories = stats['by_category']
+        color_palette = ['#007bff', '#28a745', '#ffc107', '#dc3545', '#17a2b8', '#6f42c1', '#fd7e14']
+        charts = {
+            'severity_distribution': {
+                'labels': ['Critical', 'High', 'Medium', 'Low', 'Info'],
+                'data': severity_data,
+                'colors': ['#dc3545', '#fd7e14', '#ffc107', '#28a745', '#17a2b8']
+            },
+            'category_distribution': {
+                'labels': list(categories.keys()),
+                'data': list(categories.values()),
+                'colors': [color_palette[i % len(color_palette)] for i in range(len(categories))]
+            },
+            'cvss_distribution': {
+                'labels': ['0-3.9', '4.0-6.9', '7.0-8.9', '9.0-10.0'],
+                'data': chart_cvss_data,
+                'colors': ['#28a745', '#ffc107', '#fd7e14', '#dc3545']
+            },
+            'trend_analysis': {
+                'labels': [],
+                'data': [],
+                'colors': []
+            }
+        }
+        
+        return {
+            'statistics': stats,
+            'charts': charts,
+            'risk_matrix': matrix,
+            'compliance_summary': frameworks
+        }
     
-    def generate_recommendations(self, findings):
+    def generate_advanced_statistics(self, findings):
+        """Generate comprehensive statistics"""
+        return self._aggregate(findings)['statistics']
+    
+    def generate_risk_matrix(self, findings):
+        """Generate risk matrix data"""
+        return self._aggregate(findings)['risk_matrix']
+    
+    def generate_compliance_summary(self, findings):
+        """Generate compliance framework summary"""
+        return self._aggregate(findings)['compliance_summary']
+    
+    def generate_recommendations(self, findings, stats=None):
         """Generate strategic recommendations"""
         recommendations = []
         
         # Count critical and high severity findings
-        critical_count = sum(1 for f in findings if f.get('severity', '').lower() == 'critical')
-        high_count = sum(1 for f in findings if f.get('severity', '').lower() == 'high')
+        if stats is None:
+            stats = self._aggregate(findings)['statistics']
+        critical_count = stats['by_severity']['critical']
+        high_count = stats['by_severity']['high']
         
         if critical_count > 0:
             recommendations.append({
@@ -302,149 +552,20 @@ class AdvancedHTMLGenerator:
                 'impact': 'High'
             })
         
-        # Add general recommendations
-        recommendations.extend([
-            {
-                'priority': 'Medium',
-                'category': 'Security Controls',
-                'description': 'Implement comprehensive security monitoring and alerting',
-                'timeline': '2-4 weeks',
-                'effort': 'Medium',
-                'impact': 'Medium'
-            },
-            {
-                'priority': 'Medium',
-                'category': 'Process Improvement',
-                'description': 'Establish regular security assessments and vulnerability management',
-                'timeline': '1-3 months',
-                'effort': 'Medium',
-                'impact': 'Medium'
-            },
-            {
-                'priority': 'Low',
-                'category': 'Training & Awareness',
-                'description': 'Conduct security awareness training for all personnel',
-                'timeline': '3-6 months',
-                'effort': 'Low',
-                'impact': 'Medium'
-            }
-        ])
-        
-        return recommendations
+        # Add general recommendations (copied, so callers get plain mutable dicts)
+        return [*recommendations, *(dict(recommendation) for recommendation in _STATIC_RECOMMENDATIONS)]
     
     def generate_next_steps(self, findings, stats):
         """Generate next steps based on findings"""
-        steps = []
-        
+        steps = list(_STATIC_NEXT_STEPS)
         if stats['by_severity']['critical'] > 0:
-            steps.append({
-                'step': 1,
-                'action': 'Emergency Response',
-                'description': 'Initiate incident response procedures for critical vulnerabilities',
-                'owner': 'Security Team',
-                'deadline': '24 hours'
-            })
+            steps.insert(0, _EMERGENCY_RESPONSE_STEP)
         
-        steps.extend([
-            {
-                'step': len(steps) + 1,
-                'action': 'Vulnerability Prioritization',
-                'description': 'Prioritize vulnerabilities based on risk matrix and business impact',
-                'owner': 'Security Team',
-                'deadline': '48 hours'
-            },
-            {
-                'step': len(steps) + 1,
-                'action': 'Remediation Planning',
-                'description': 'Create detailed remediation plans for each vulnerability',
-                'owner': 'IT/Security Teams',
-                'deadline': '1 week'
-            },
-            {
-                'step': len(steps) + 1,
-                'action': 'Implementation',
-                'description': 'Execute remediation plans according to priority',
-                'owner': 'IT Teams',
-                'deadline': '4 weeks'
-            },
-            {
-                'step': len(steps) + 1,
-                'action': 'Validation',
-                'description': 'Verify that vulnerabilities have been properly addressed',
-                'owner': 'Security Team',
-                'deadline': '6 weeks'
-            }
-        ])
-        
-        return steps
+        return [{'step': number, **step} for number, step in enumerate(steps, 1)]
     
     def generate_charts_data(self, findings):
         """Generate data for charts and visualizations"""
-        charts = {
-            'severity_distribution': {
-                'labels': ['Critical', 'High', 'Medium', 'Low', 'Info'],
-                'data': [0, 0, 0, 0, 0],
-                'colors': ['#dc3545', '#fd7e14', '#ffc107', '#28a745', '#17a2b8']
-            },
-            'category_distribution': {
-                'labels': [],
-                'data': [],
-                'colors': []
-            },
-            'cvss_distribution': {
-                'labels': ['0-3.9', '4.0-6.9', '7.0-8.9', '9.0-10.0'],
-                'data': [0, 0, 0, 0],
-                'colors': ['#28a745', '#ffc107', '#fd7e14', '#dc3545']
-            },
-            'trend_analysis': {
-                'labels': [],
-                'data': [],
-                'colors': []
-            }
-        }
-        
-        # Process severity distribution
-        for finding in findings:
-            severity = finding.get('severity', 'medium').lower()
-            if severity == 'critical':
-                charts['severity_distribution']['data'][0] += 1
-            elif severity == 'high':
-                charts['severity_distribution']['data'][1] += 1
-            elif severity == 'medium':
-                charts['severity_distribution']['data'][2] += 1
-            elif severity == 'low':
-                charts['severity_distribution']['data'][3] += 1
-            else:
-                charts['severity_distribution']['data'][4] += 1
-        
-        # Process category distribution
-        categories = {}
-        for finding in findings:
-            category = finding.get('category', 'Other')
-            categories[category] = categories.get(category, 0) + 1
-        
-        charts['category_distribution']['labels'] = list(categories.keys())
-        charts['category_distribution']['data'] = list(categories.values())
-        
-        # Generate colors for categories
-        color_palette = ['#007bff', '#28a745', '#ffc107', '#dc3545', '#17a2b8', '#6f42c1', '#fd7e14']
-        charts['category_distribution']['colors'] = [
-            color_palette[i % len(color_palette)] for i in range(len(categories))
-        ]
-        
-        # Process CVSS distribution
-        for finding in findings:
-            cvss = finding.get('cvss_score', 0)
-            if cvss < 4:
-                charts['cvss_distribution']['data'][0] += 1
-            elif cvss < 7:
-                charts['cvss_distribution']['data'][1] += 1
-            elif cvss < 9:
-                charts['cvss_distribution']['data'][2] += 1
-            else:
-                charts['cvss_distribution']['data'][3] += 1
-        
-        return charts
+        return self._aggregate(findings)['charts']
     
     def get_default_config(self):
         """Get default report configuration"""
@@ -467,25 +588,11 @@ class AdvancedHTMLGenerator:
     
     def get_severity_color(self, severity):
         """Get color for severity level"""
-        colors = {
-            'critical': '#dc3545',
-            'high': '#fd7e14',
-            'medium': '#ffc107',
-            'low': '#28a745',
-            'info': '#17a2b8'
-        }
-        return colors.get(severity.lower(), '#6c757d')
+        return _severity_color(severity)
     
     def get_severity_icon(self, severity):
         """Get icon for severity level"""
-        icons = {
-            'critical': '🔴',
-            'high': '🟠',
-            'medium': '🟡',
-            'low': '🟢',
-            'info': '🔵'
-        }
-        return icons.get(severity.lower(), '⚪')
+        return _severity_icon(severity)
     
     def format_date(self, date_string):
         """Format date string"""
@@ -501,15 +608,7 @@ class AdvancedHTMLGenerator:
     def calculate_cvss_score(self, finding):
         """Calculate CVSS score from finding data"""
         # Simplified CVSS calculation
-        severity = finding.get('severity', 'medium').lower()
-        scores = {
-            'critical': 9.5,
-            'high': 7.5,
-            'medium': 5.0,
-            'low': 2.5,
-            'info': 0.0
-        }
-        return scores.get(severity, 5.0)
+        return _severity_score(finding.get('severity', 'medium'))
     
     def truncate_smart(self, text, length=100):
         """Smart text truncation"""
@@ -527,7 +626,11 @@ class AdvancedHTMLGenerator:
     
     def create_industrial_template(self, template_path):
         """Create industrial-level HTML template"""
-        template_content = """<!DOCTYPE html>
+        Path(template_path).write_text(_INDUSTRIAL_TEMPLATE, encoding='utf-8')
+        logger.info("[OK] Created industrial HTML template: %s", template_path)
+
+# Industrial report template, written to the templates directory when missing
+_INDUSTRIAL_TEMPLATE = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -1395,11 +1498,6 @@ class AdvancedHTMLGenerator:
     </div>
 </body>
 </html>"""
-        
-        with open(template_path, 'w', encoding='utf-8') as f:
-            f.write(template_content)
-        
-        print(f"[OK] Created industrial HTML template: {template_path}")
 
 # Legacy function for backward compatibility
 def export(findings, output_path=None, template_name="default.html.j2"):
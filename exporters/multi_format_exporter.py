@@ -11,17 +11,55 @@ from datetime import datetime
 from pathlib import Path
 import uuid
 import os
+import textwrap
+
+# Optional streaming JSON parser for large findings files
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Optional fast JSON encoder
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def _json_member(key, value):
+    """Format one top-level member of an indent=2 JSON object"""
+    return textwrap.indent(f"{json.dumps(key)}: {json.dumps(value, indent=2, ensure_ascii=False)}", '  ')
+
+def _write_json(data, output_path):
+    """Write data as indented UTF-8 JSON, using orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
 
 class MultiFormatExporter:
     """Export security findings to multiple industrial formats"""
     
+    CSV_FIELDNAMES = [
+        'id', 'title', 'description', 'severity', 'cvss_score',
+        'category', 'subcategory', 'host', 'port', 'service',
+        'impact', 'evidence', 'remediation', 'source',
+        'discovery_date', 'last_seen', 'confidence'
+    ]
+    
+    # Formats export_streaming can write one finding at a time
+    STREAMING_FORMATS = ('json', 'csv')
+    
     def __init__(self):
         self.supported_formats = [
             'json', 'csv', 'xml', 'sarif', 'stix', 'mitre', 'nist',
             'excel', 'markdown', 'txt', 'yaml', 'junit'
         ]
     
-    def export(self, findings, output_path, format_type='json', metadata=None):
+    def export(self, findings, output_path, format_type='json', metadata=None, precomputed_stats=None):
         """
         Export findings to specified format
         
@@ -30,6 +68,7 @@ class MultiFormatExporter:
             output_path (str): Output file path
             format_type (str): Export format type
             metadata (dict): Additional metadata
+            precomputed_stats (dict): Result of precompute_stats for these findings, shared across formats
         
         Returns:
             str: Path to exported file
@@ -43,11 +82,11 @@ class MultiFormatExporter:
         
         # Export based on format type
         if format_type == 'json':
-            return self.export_json(findings, output_path, metadata)
+            return self.export_json(findings, output_path, metadata, precomputed_stats)
         elif format_type == 'csv':
             return self.export_csv(findings, output_path, metadata)
         elif format_type == 'xml':
-            return self.export_xml(findings, output_path, metadata)
+            return self.export_xml(findings, output_path, metadata, precomputed_stats)
         elif format_type == 'sarif':
             return self.export_sarif(findings, output_path, metadata)
         elif format_type == 'stix':
@@ -57,32 +96,31 @@ class MultiFormatExporter:
         elif format_type == 'nist':
             return self.export_nist(findings, output_path, metadata)
         elif format_type == 'excel':
-            return self.export_excel(findings, output_path, metadata)
+            return self.export_excel(findings, output_path, metadata, precomputed_stats)
         elif format_type == 'markdown':
-            return self.export_markdown(findings, output_path, metadata)
+            return self.export_markdown(findings, output_path, metadata, precomputed_stats)
         elif format_type == 'txt':
-            return self.export_txt(findings, output_path, metadata)
+            return self.export_txt(findings, output_path, metadata, precomputed_stats)
         elif format_type == 'yaml':
-            return self.export_yaml(findings, output_path, metadata)
+            return self.export_yaml(findings, output_path, metadata, precomputed_stats)
         elif format_type == 'junit':
             return self.export_junit(findings, output_path, metadata)
         else:
             raise ValueError(f"Unsupported format: {format_type}")
     
-    def export_json(self, findings, output_path, metadata):
+    def export_json(self, findings, output_path, metadata, precomputed_stats=None):
         """Export to JSON format"""
         try:
             report_data = {
                 'metadata': metadata,
-                'summary': self.generate_summary(findings),
+                'summary': self._summary(findings, precomputed_stats),
                 'findings': findings,
-                'statistics': self.generate_statistics(findings),
+                'statistics': self._statistics(findings, precomputed_stats),
                 'generated_at': datetime.now().isoformat(),
                 'schema_version': '1.0'
             }
             
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(report_data, f, indent=2, ensure_ascii=False)
+            _write_json(report_data, output_path)
             
             print(f"[OK] JSON export completed: {output_path}")
             return output_path
@@ -94,39 +132,12 @@ class MultiFormatExporter:
     def export_csv(self, findings, output_path, metadata):
         """Export to CSV format"""
         try:
-            fieldnames = [
-                'id', 'title', 'description', 'severity', 'cvss_score',
-                'category', 'subcategory', 'host', 'port', 'service',
-                'impact', 'evidence', 'remediation', 'source',
-                'discovery_date', 'last_seen', 'confidence'
-            ]
-            
             with open(output_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
+                writer = csv.DictWriter(f, fieldnames=self.CSV_FIELDNAMES)
                 writer.writeheader()
                 
                 for finding in findings:
-                    # Flatten finding data for CSV
-                    csv_row = {
-                        'id': finding.get('id', str(uuid.uuid4())),
-                        'title': finding.get('title', ''),
-                        'description': finding.get('description', ''),
-                        'severity': finding.get('severity', ''),
-                        'cvss_score': finding.get('cvss_score', ''),
-                        'category': finding.get('category', ''),
-                        'subcategory': finding.get('subcategory', ''),
-                        'host': finding.get('host', ''),
-                        'port': finding.get('port', ''),
-                        'service': finding.get('service', ''),
-                        'impact': finding.get('impact', ''),
-                        'evidence': finding.get('evidence', ''),
-                        'remediation': finding.get('remediation', ''),
-                        'source': finding.get('source', ''),
-                        'discovery_date': finding.get('discovery_date', ''),
-                        'last_seen': finding.get('last_seen', ''),
-                        'confidence': finding.get('confidence', '')
-                    }
-                    writer.writerow(csv_row)
+                    writer.writerow(self.csv_row(finding))
             
             print(f"[OK] CSV export completed: {output_path}")
             return output_path
@@ -135,7 +146,29 @@ class MultiFormatExporter:
             print(f"[ERROR] CSV export failed: {str(e)}")
             raise
     
-    def export_xml(self, findings, output_path, metadata):
+    def csv_row(self, finding):
+        """Flatten finding data for CSV"""
+        return {
+            'id': finding.get('id', str(uuid.uuid4())),
+            'title': finding.get('title', ''),
+            'description': finding.get('description', ''),
+            'severity': finding.get('severity', ''),
+            'cvss_score': finding.get('cvss_score', ''),
+            'category': finding.get('category', ''),
+            'subcategory': finding.get('subcategory', ''),
+            'host': finding.get('host', ''),
+            'port': finding.get('port', ''),
+            'service': finding.get('service', ''),
+            'impact': finding.get('impact', ''),
+            'evidence': finding.get('evidence', ''),
+            'remediation': finding.get('remediation', ''),
+            'source': finding.get('source', ''),
+            'discovery_date': finding.get('discovery_date', ''),
+            'last_seen': finding.get('last_seen', ''),
+            'confidence': finding.get('confidence', '')
+        }
+    
+    def export_xml(self, findings, output_path, metadata, precomputed_stats=None):
         """Export to XML format"""
         try:
             root = ET.Element('security_report')
@@ -148,7 +181,7 @@ class MultiFormatExporter:
             
             # Add summary
             summary_elem = ET.SubElement(root, 'summary')
-            summary_data = self.generate_summary(findings)
+            summary_data = self._summary(findings, precomputed_stats)
             for key, value in summary_data.items():
                 elem = ET.SubElement(summary_elem, key)
                 elem.text = str(value)
@@ -219,8 +252,7 @@ class MultiFormatExporter:
                 ]
             }
             
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(sarif_report, f, indent=2, ensure_ascii=False)
+            _write_json(sarif_report, output_path)
             
             print(f"[OK] SARIF export completed: {output_path}")
             return output_path
@@ -267,8 +299,7 @@ class MultiFormatExporter:
                 }
                 stix_bundle['objects'].append(vulnerability)
             
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(stix_bundle, f, indent=2, ensure_ascii=False)
+            _write_json(stix_bundle, output_path)
             
             print(f"[OK] STIX export completed: {output_path}")
             return output_path
@@ -306,8 +337,7 @@ class MultiFormatExporter:
                     if technique not in mitre_report['techniques']:
                         mitre_report['techniques'].append(technique)
             
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(mitre_report, f, indent=2, ensure_ascii=False)
+            _write_json(mitre_report, output_path)
             
             print(f"[OK] MITRE ATT&CK export completed: {output_path}")
             return output_path
@@ -345,8 +375,7 @@ class MultiFormatExporter:
                 }
                 nist_report['findings_mapping'].append(finding_mapping)
             
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(nist_report, f, indent=2, ensure_ascii=False)
+            _write_json(nist_report, output_path)
             
             print(f"[OK] NIST Framework export completed: {output_path}")
             return output_path
@@ -355,7 +384,7 @@ class MultiFormatExporter:
             print(f"[ERROR] NIST export failed: {str(e)}")
             raise
     
-    def export_excel(self, findings, output_path, metadata):
+    def export_excel(self, findings, output_path, metadata, precomputed_stats=None):
         """Export to Excel format"""
         try:
             # Try to use openpyxl if available
@@ -371,7 +400,7 @@ class MultiFormatExporter:
                 ws_summary.title = 'Executive Summary'
                 
                 # Add summary data
-                summary_data = self.generate_summary(findings)
+                summary_data = self._summary(findings, precomputed_stats)
                 row = 1
                 for key, value in summary_data.items():
                     ws_summary.cell(row=row, column=1, value=key.replace('_', ' ').title())
@@ -423,10 +452,10 @@ class MultiFormatExporter:
             print(f"[ERROR] Excel export failed: {str(e)}")
             raise
     
-    def export_markdown(self, findings, output_path, metadata):
+    def export_markdown(self, findings, output_path, metadata, precomputed_stats=None):
         """Export to Markdown format"""
         try:
-            md_content = f"""# {metadata.get('title', 'Cybersecurity Assessment Report')}
+            parts = [f"""# {metadata.get('title', 'Cybersecurity Assessment Report')}
 
 ## Executive Summary
 
@@ -437,40 +466,40 @@ class MultiFormatExporter:
 
 ## Summary Statistics
 
-"""
+"""]
             
             # Add statistics
-            stats = self.generate_statistics(findings)
-            md_content += f"| Severity | Count |\n|----------|-------|\n"
+            stats = self._statistics(findings, precomputed_stats)
+            parts.append(f"| Severity | Count |\n|----------|-------|\n")
             for severity, count in stats.get('by_severity', {}).items():
-                md_content += f"| {severity.title()} | {count} |\n"
+                parts.append(f"| {severity.title()} | {count} |\n")
             
-            md_content += "\n## Detailed Findings\n\n"
+            parts.append("\n## Detailed Findings\n\n")
             
             # Add findings
             for i, finding in enumerate(findings, 1):
-                md_content += f"### {i}. {finding.get('title', 'Unknown Vulnerability')}\n\n"
-                md_content += f"**Severity:** {finding.get('severity', 'Unknown')}  \n"
-                md_content += f"**CVSS Score:** {finding.get('cvss_score', 'N/A')}  \n"
-                md_content += f"**Category:** {finding.get('category', 'Unknown')}  \n"
-                md_content += f"**Host:** {finding.get('host', 'N/A')}  \n"
-                md_content += f"**Port:** {finding.get('port', 'N/A')}  \n\n"
+                parts.append(f"### {i}. {finding.get('title', 'Unknown Vulnerability')}\n\n")
+                parts.append(f"**Severity:** {finding.get('severity', 'Unknown')}  \n")
+                parts.append(f"**CVSS Score:** {finding.get('cvss_score', 'N/A')}  \n")
+                parts.append(f"**Category:** {finding.get('category', 'Unknown')}  \n")
+                parts.append(f"**Host:** {finding.get('host', 'N/A')}  \n")
+                parts.append(f"**Port:** {finding.get('port', 'N/A')}  \n\n")
                 
-                md_content += f"**Description:**  \n{finding.get('description', 'No description available')}\n\n"
+                parts.append(f"**Description:**  \n{finding.get('description', 'No description available')}\n\n")
                 
                 if finding.get('impact'):
-                    md_content += f"**Impact:**  \n{finding.get('impact')}\n\n"
+                    parts.append(f"**Impact:**  \n{finding.get('impact')}\n\n")
                 
                 if finding.get('evidence'):
-                    md_content += f"**Evidence:**  \n```\n{finding.get('evidence')}\n```\n\n"
+                    parts.append(f"**Evidence:**  \n```\n{finding.get('evidence')}\n```\n\n")
                 
                 if finding.get('remediation'):
-                    md_content += f"**Remediation:**  \n{finding.get('remediation')}\n\n"
+                    parts.append(f"**Remediation:**  \n{finding.get('remediation')}\n\n")
                 
-                md_content += "---\n\n"
+                parts.append("---\n\n")
             
             with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(md_content)
+                f.write(''.join(parts))
             
             print(f"[OK] Markdown export completed: {output_path}")
             return output_path
@@ -479,10 +508,10 @@ class MultiFormatExporter:
             print(f"[ERROR] Markdown export failed: {str(e)}")
             raise
     
-    def export_txt(self, findings, output_path, metadata):
+    def export_txt(self, findings, output_path, metadata, precomputed_stats=None):
         """Export to plain text format"""
         try:
-            txt_content = f"""{metadata.get('title', 'CYBERSECURITY ASSESSMENT REPORT')}
+            parts = [f"""{metadata.get('title', 'CYBERSECURITY ASSESSMENT REPORT')}
 {'=' * 60}
 
 Organization: {metadata.get('organization', 'N/A')}
@@ -495,43 +524,43 @@ EXECUTIVE SUMMARY
 
 This report contains {len(findings)} security findings identified during the assessment.
 
-"""
+"""]
             
             # Add statistics
-            stats = self.generate_statistics(findings)
-            txt_content += "SEVERITY DISTRIBUTION\n"
-            txt_content += "-" * 20 + "\n"
+            stats = self._statistics(findings, precomputed_stats)
+            parts.append("SEVERITY DISTRIBUTION\n")
+            parts.append("-" * 20 + "\n")
             for severity, count in stats.get('by_severity', {}).items():
-                txt_content += f"{severity.title():<10}: {count}\n"
+                parts.append(f"{severity.title():<10}: {count}\n")
             
-            txt_content += "\nDETAILED FINDINGS\n"
-            txt_content += "=" * 17 + "\n\n"
+            parts.append("\nDETAILED FINDINGS\n")
+            parts.append("=" * 17 + "\n\n")
             
             # Add findings
             for i, finding in enumerate(findings, 1):
-                txt_content += f"{i}. {finding.get('title', 'Unknown Vulnerability')}\n"
-                txt_content += "-" * (len(str(i)) + 2 + len(finding.get('title', 'Unknown Vulnerability'))) + "\n"
-                txt_content += f"Severity: {finding.get('severity', 'Unknown')}\n"
-                txt_content += f"CVSS Score: {finding.get('cvss_score', 'N/A')}\n"
-                txt_content += f"Category: {finding.get('category', 'Unknown')}\n"
-                txt_content += f"Host: {finding.get('host', 'N/A')}\n"
-                txt_content += f"Port: {finding.get('port', 'N/A')}\n\n"
+                parts.append(f"{i}. {finding.get('title', 'Unknown Vulnerability')}\n")
+                parts.append("-" * (len(str(i)) + 2 + len(finding.get('title', 'Unknown Vulnerability'))) + "\n")
+                parts.append(f"Severity: {finding.get('severity', 'Unknown')}\n")
+                parts.append(f"CVSS Score: {finding.get('cvss_score', 'N/A')}\n")
+                parts.append(f"Category: {finding.get('category', 'Unknown')}\n")
+                parts.append(f"Host: {finding.get('host', 'N/A')}\n")
+                parts.append(f"Port: {finding.get('port', 'N/A')}\n\n")
                 
-                txt_content += f"Description:\n{finding.get('description', 'No description available')}\n\n"
+                parts.append(f"Description:\n{finding.get('description', 'No description available')}\n\n")
                 
                 if finding.get('impact'):
-                    txt_content += f"Impact:\n{finding.get('impact')}\n\n"
+                    parts.append(f"Impact:\n{finding.get('impact')}\n\n")
                 
                 if finding.get('evidence'):
-                    txt_content += f"Evidence:\n{finding.get('evidence')}\n\n"
+                    parts.append(f"Evidence:\n{finding.get('evidence')}\n\n")
                 
                 if finding.get('remediation'):
-                    txt_content += f"Remediation:\n{finding.get('remediation')}\n\n"
+                    parts.append(f"Remediation:\n{finding.get('remediation')}\n\n")
                 
-                txt_content += "=" * 60 + "\n\n"
+                parts.append("=" * 60 + "\n\n")
             
             with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(txt_content)
+                f.write(''.join(parts))
             
             print(f"[OK] Text export completed: {output_path}")
             return output_path
@@ -540,16 +569,16 @@ This report contains {len(findings)} security findings identified during the ass
             print(f"[ERROR] Text export failed: {str(e)}")
             raise
     
-    def export_yaml(self, findings, output_path, metadata):
+    def export_yaml(self, findings, output_path, metadata, precomputed_stats=None):
         """Export to YAML format"""
         try:
             import yaml
             
             report_data = {
                 'metadata': metadata,
-                'summary': self.generate_summary(findings),
+                'summary': self._summary(findings, precomputed_stats),
                 'findings': findings,
-                'statistics': self.generate_statistics(findings),
+                'statistics': self._statistics(findings, precomputed_stats),
                 'generated_at': datetime.now().isoformat()
             }
             
@@ -638,24 +667,65 @@ This report contains {len(findings)} security findings identified during the ass
         }
         
         for finding in findings:
-            # By severity
-            severity = finding.get('severity', 'unknown').lower()
-            stats['by_severity'][severity] = stats['by_severity'].get(severity, 0) + 1
-            
-            # By category
-            category = finding.get('category', 'unknown')
-            stats['by_category'][category] = stats['by_category'].get(category, 0) + 1
-            
-            # By host
-            host = finding.get('host', 'unknown')
-            stats['by_host'][host] = stats['by_host'].get(host, 0) + 1
-            
-            # By source
-            source = finding.get('source', 'unknown')
-            stats['by_source'][source] = stats['by_source'].get(source, 0) + 1
+            self.count_finding(stats, finding)
         
         return stats
     
+    def count_finding(self, stats, finding):
+        """Add one finding to a generate_statistics-style counts dict"""
+        # By severity
+        severity = finding.get('severity', 'unknown').lower()
+        stats['by_severity'][severity] = stats['by_severity'].get(severity, 0) + 1
+        
+        # By category
+        category = finding.get('category', 'unknown')
+        stats['by_category'][category] = stats['by_category'].get(category, 0) + 1
+        
+        # By host
+        host = finding.get('host', 'unknown')
+        stats['by_host'][host] = stats['by_host'].get(host, 0) + 1
+        
+        # By source
+        source = finding.get('source', 'unknown')
+        stats['by_source'][source] = stats['by_source'].get(source, 0) + 1
+    
+    def precompute_stats(self, findings):
+        """
+        Compute summary and statistics once so several formats can share them
+        
+        Args:
+            findings (list): List of security findings
+        
+        Returns:
+            dict: {'summary': dict, 'statistics': dict}
+        """
+        statistics = self.generate_statistics(findings)
+        return {'summary': self.summary_from_statistics(statistics), 'statistics': statistics}
+    
+    def summary_from_statistics(self, statistics):
+        """Build the generate_summary dict from generate_statistics counts"""
+        by_severity = statistics['by_severity']
+        return {
+            'total_findings': statistics['total'],
+            'critical_findings': by_severity.get('critical', 0),
+            'high_findings': by_severity.get('high', 0),
+            'medium_findings': by_severity.get('medium', 0),
+            'low_findings': by_severity.get('low', 0),
+            'info_findings': by_severity.get('info', 0)
+        }
+    
+    def _summary(self, findings, precomputed_stats=None):
+        """Summary from precomputed stats when available"""
+        if precomputed_stats:
+            return precomputed_stats['summary']
+        return self.generate_summary(findings)
+    
+    def _statistics(self, findings, precomputed_stats=None):
+        """Statistics from precomputed stats when available"""
+        if precomputed_stats:
+            return precomputed_stats['statistics']
+        return self.generate_statistics(findings)
+    
     def generate_sarif_rules(self, findings):
         """Generate SARIF rules from findings"""
         rules = []
@@ -762,6 +832,118 @@ This report contains {len(findings)} security findings identified during the ass
         
         return subcategories if subcategories else ['ID.AM-1']  # Default to asset management
     
+    def iter_findings(self, findings_path):
+        """
+        Yield findings from a JSON array file one at a time
+        
+        Args:
+            findings_path (str): Path to a JSON file containing a list of findings
+        
+        Yields:
+            dict: Finding
+        """
+        with open(findings_path, 'rb') as f:
+            if IJSON_AVAILABLE:
+                yield from ijson.items(f, 'item', use_float=True)
+            else:
+                yield from json.load(f)
+    
+    def export_streaming(self, findings_path, base_path, formats=['json', 'csv'], metadata=None):
+        """
+        Export a findings file without loading it into memory
+        
+        JSON and CSV outputs are written in a single pass over the file; other
+        formats need the whole list and are exported from a full load.
+        
+        Args:
+            findings_path (str): Path to a JSON file containing a list of findings
+            base_path (str): Output path without extension
+            formats (list): Formats to export
+            metadata (dict): Additional metadata
+        
+        Returns:
+            list: Paths of exported files
+        """
+        if not metadata:
+            metadata = self.get_default_metadata()
+        
+        streaming = [fmt for fmt in formats if fmt in self.STREAMING_FORMATS]
+        if os.path.abspath(f"{base_path}.json") == os.path.abspath(findings_path):
+            # Writing the JSON output would truncate the file being read
+            streaming = [fmt for fmt in streaming if fmt != 'json']
+        exported_files = []
+        
+        if streaming:
+            try:
+                exported_files.extend(self._export_streaming(findings_path, base_path, streaming, metadata))
+            except Exception as e:
+                print(f"[ERROR] Streaming export failed: {str(e)}")
+        
+        remaining = [fmt for fmt in formats if fmt not in streaming]
+        if remaining:
+            findings = list(self.iter_findings(findings_path))
+            exported_files.extend(export_to_multiple_formats(findings, base_path, remaining, metadata))
+        
+        return exported_files
+    
+    def _export_streaming(self, findings_path, base_path, formats, metadata):
+        """Write the streaming formats in one pass over the findings file"""
+        dirname = os.path.dirname(base_path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        
+        json_path = f"{base_path}.json"
+        csv_path = f"{base_path}.csv"
+        json_file = open(json_path, 'w', encoding='utf-8') if 'json' in formats else None
+        csv_file = open(csv_path, 'w', newline='', encoding='utf-8') if 'csv' in formats else None
+        
+        stats = {
+            'total': 0,
+            'by_severity': {},
+            'by_category': {},
+            'by_host': {},
+            'by_source': {}
+        }
+        
+        try:
+            if csv_file:
+                writer = csv.DictWriter(csv_file, fieldnames=self.CSV_FIELDNAMES)
+                writer.writeheader()
+            if json_file:
+                json_file.write('{\n' + _json_member('metadata', metadata) + ',\n  "findings": [')
+            
+            for finding in self.iter_findings(findings_path):
+                if json_file:
+                    item = json.dumps(finding, indent=2, ensure_ascii=False)
+                    json_file.write((',\n' if stats['total'] else '\n') + textwrap.indent(item, '    '))
+                if csv_file:
+                    writer.writerow(self.csv_row(finding))
+                stats['total'] += 1
+                self.count_finding(stats, finding)
+            
+            if json_file:
+                json_file.write('\n  ],\n' if stats['total'] else '],\n')
+                json_file.write(',\n'.join([
+                    _json_member('summary', self.summary_from_statistics(stats)),
+                    _json_member('statistics', stats),
+                    _json_member('generated_at', datetime.now().isoformat()),
+                    _json_member('schema_version', '1.0')
+                ]) + '\n}')
+        finally:
+            if json_file:
+                json_file.close()
+            if csv_file:
+                csv_file.close()
+        
+        exported_files = []
+        if json_file:
+            print(f"[OK] JSON export completed: {json_path}")
+            exported_files.append(json_path)
+        if csv_file:
+            print(f"[OK] CSV export completed: {csv_path}")
+            exported_files.append(csv_path)
+        return exported_files
+    
     def get_default_metadata(self):
         """Get default metadata for exports"""
         return {
@@ -800,6 +982,11 @@ def export_to_multiple_formats(findings, base_path, formats=['json', 'csv', 'xml
     
     return exported_files
 
+def export_to_multiple_formats_streaming(findings_path, base_path, formats=['json', 'csv'], metadata=None):
+    """Export a findings JSON file to multiple formats, streaming it where possible"""
+    exporter = MultiFormatExporter()
+    return exporter.export_streaming(findings_path, base_path, formats, metadata)
+
 if __name__ == "__main__":
     # Test the multi-format exporter
     test_findings = [
@@ -12,6 +12,9 @@ from datetime import datetime
 import base64
 import io
 
+# Buffer size for writing generated PDFs (reports can be several MB)
+WRITE_BUFFER_SIZE = 1 << 17
+
 # Try to import various PDF libraries
 try:
     from weasyprint import HTML, CSS
@@ -85,7 +88,7 @@ class AdvancedPDFExporter:
         }
     
     def export(self, html_file_path, output_path=None, format_type='executive', 
-               method='auto', include_charts=True, watermark=None):
+               method='auto', include_charts=True, watermark=None, method_hint=None):
         """
         Export HTML report to PDF with advanced features
         
@@ -96,6 +99,7 @@ class AdvancedPDFExporter:
             method (str): Export method ('auto', 'weasyprint', 'reportlab', 'wkhtmltopdf', 'chrome')
             include_charts (bool): Include charts and visualizations
             watermark (str): Watermark text
+            method_hint (str): Method to prefer over the default choice when method is 'auto' and it is available
         
         Returns:
             str: Path to generated PDF
@@ -111,7 +115,10 @@ class AdvancedPDFExporter:
             
             # Select export method
             if method == 'auto':
-                method = self.select_best_method()
+                if method_hint and self.is_method_available(method_hint):
+                    method = method_hint
+                else:
+                    method = self.select_best_method()
             
             # Get PDF style configuration
             style_config = self.pdf_styles.get(format_type, self.pdf_styles['executive'])
@@ -157,6 +164,20 @@ class AdvancedPDFExporter:
         else:
             return 'fallback'
     
+    def is_method_available(self, method):
+        """Check whether a specific export method can be used"""
+        if method == 'weasyprint':
+            return WEASYPRINT_AVAILABLE
+        elif method == 'reportlab':
+            return REPORTLAB_AVAILABLE
+        elif method == 'wkhtmltopdf':
+            return self.check_wkhtmltopdf()
+        elif method == 'chrome':
+            return bool(self.check_chrome())
+        elif method == 'puppeteer':
+            return self.check_puppeteer()
+        return False
+    
     def export_with_weasyprint_advanced(self, html_file_path, output_path, style_config):
         """Export with WeasyPrint using advanced styling"""
         try:
@@ -171,11 +192,12 @@ class AdvancedPDFExporter:
             
             # Convert HTML to PDF
             print(f"[INFO] Converting with WeasyPrint Advanced...")
-            HTML(filename=html_file_path).write_pdf(
-                output_path,
-                stylesheets=[css_obj],
-                font_config=font_config
-            )
+            with open(output_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+                HTML(filename=html_file_path).write_pdf(
+                    f,
+                    stylesheets=[css_obj],
+                    font_config=font_config
+                )
             
             if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
                 print(f"[OK] Advanced PDF generated with WeasyPrint: {output_path}")
@@ -21,7 +21,7 @@ from exporters import (
     export_all_formats, export_compliance_pack, export_executive_summary,
     export_technical_report, get_export_info
 )
-from ai import summarizer, severity_classifier, remediation_generator
+from ai import analyzer
 from tools.runner import register_tool, execute_tool, list_tools
 from tools.parser import parse_output
 from utils.file_loader import save_json, load_json
@@ -67,13 +67,14 @@ def enhance(file, output):
     try:
         findings = load_json(file)
         
-        for i, finding in enumerate(findings):
-            click.echo(f"Processing finding {i+1}/{len(findings)}: {finding.get('title', 'Unknown')}")
-            
-            # Add AI enhancements
-            finding["ai_summary"] = summarizer.generate(finding)
-            finding["severity"] = severity_classifier.classify(finding)
-            finding["remediation"] = remediation_generator.suggest(finding)
+        click.echo(f"Processing {len(findings)} findings...")
+        
+        # Add AI enhancements: one concurrent request per distinct finding returns
+        # summary, severity and remediation together
+        for finding, analysis in zip(findings, analyzer.analyze_all(findings)):
+            finding["ai_summary"] = analysis["summary"]
+            finding["severity"] = analysis["severity"]
+            finding["remediation"] = analysis["remediation"]
         
         save_json(findings, output)
         click.echo(f"[OK] Enhanced findings saved to {output}")
@@ -182,6 +183,26 @@ def export(file, format, output, theme, advanced):
 @click.option('--advanced', '-adv', is_flag=True, default=True, help='Use advanced industrial-level formatting')
 def full_report(input, type, format, theme, advanced):
     """One-click: Parse → AI Enhance → Export with industrial-level formatting"""
+    try:
+        generate_full_report(input, type, format, theme, advanced)
+    except Exception:
+        # The failing step has already reported its error
+        sys.exit(1)
+
+def generate_full_report(input, type='auto', format='executive', theme='executive', advanced=True):
+    """
+    Run the parse → AI enhance → export pipeline for one scan file
+    
+    Args:
+        input (str): Path to scan file
+        type (str): Scan type (nmap/burp/nuclei/auto)
+        format (str): Export format
+        theme (str): Report theme for advanced PDF export
+        advanced (bool): Use advanced industrial-level formatting
+        
+    Returns:
+        str: Path to the generated report (first file for multi-file formats)
+    """
     click.echo("[LAUNCH] Running full report generation pipeline...")
     
     # Auto-detect scan type if needed
@@ -195,10 +216,10 @@ def full_report(input, type, format, theme, advanced):
                 click.echo(f"[INFO] Auto-detected scan type: {type}")
             else:
                 click.echo("[ERROR] Could not auto-detect scan type. Please specify --type")
-                sys.exit(1)
+                raise ValueError(f"Could not auto-detect scan type for {input}")
         except ImportError:
             click.echo("[WARNING] Auto-detection not available. Please specify --type")
-            sys.exit(1)
+            raise
     
     # Step 1: Parse
     click.echo("Step 1/3: Parsing scan file...")
@@ -213,96 +234,118 @@ def full_report(input, type, format, theme, advanced):
         click.echo(f"[OK] Parsed {len(findings)} findings")
     except Exception as e:
         click.echo(f"[ERROR] Parsing failed: {str(e)}", err=True)
-        sys.exit(1)
+        raise
     
     # Step 2: AI Enhancement
     click.echo("Step 2/3: AI enhancement...")
     try:
-        for i, finding in enumerate(findings):
-            click.echo(f"  Processing {i+1}/{len(findings)}: {finding.get('title', 'Unknown')}")
-            finding["ai_summary"] = summarizer.generate(finding)
-            finding["severity"] = severity_classifier.classify(finding)
-            finding["remediation"] = remediation_generator.suggest(finding)
+        click.echo(f"  Processing {len(findings)} findings...")
+        for finding, analysis in zip(findings, analyzer.analyze_all(findings)):
+            finding["ai_summary"] = analysis["summary"]
+            finding["severity"] = analysis["severity"]
+            finding["remediation"] = analysis["remediation"]
         
         click.echo(f"[OK] Enhanced {len(findings)} findings")
     except Exception as e:
         click.echo(f"[ERROR] AI enhancement failed: {str(e)}", err=True)
-        sys.exit(1)
+        raise
     
     # Step 3: Export Report
     click.echo("Step 3/3: Generating industrial-level report...")
     try:
-        # Determine base output path
-        base_path = os.path.splitext(input)[0]
+        report_path = export_report(findings, os.path.splitext(input)[0], format, theme, advanced)
+    except Exception as e:
+        click.echo(f"[ERROR] Report generation failed: {str(e)}", err=True)
+        raise
+    
+    return report_path
+
+def export_report(findings, base_path, format='executive', theme='executive', advanced=True):
+    """
+    Export enhanced findings (step 3 of the full-report pipeline)
+    
+    Args:
+        findings (list): AI-enhanced findings
+        base_path (str): Output path without extension
+        format (str): Export format
+        theme (str): Report theme for advanced PDF export
+        advanced (bool): Use advanced industrial-level formatting
         
-        if format == "all":
-            # Export all formats
-            click.echo("[EXPORT] Generating all formats...")
-            exported_files = export_all_formats(findings, base_path)
-            click.echo(f"[SUCCESS] Generated {len(exported_files)} files:")
-            for file_path in exported_files:
-                click.echo(f"  ✓ {file_path}")
-                
-        elif format == "compliance":
-            # Export compliance pack
-            click.echo("[EXPORT] Generating compliance pack...")
-            exported_files = export_compliance_pack(findings, base_path)
-            click.echo(f"[SUCCESS] Generated compliance pack ({len(exported_files)} files):")
-            for file_path in exported_files:
-                click.echo(f"  ✓ {file_path}")
-                
-        elif format == "executive":
-            # Export executive summary
-            click.echo("[EXPORT] Generating executive summary...")
-            exported_files = export_executive_summary(findings, base_path)
-            click.echo(f"[SUCCESS] Generated executive summary:")
-            for file_path in exported_files:
-                click.echo(f"  ✓ {file_path}")
-                
-        elif format == "technical":
-            # Export technical report
-            click.echo("[EXPORT] Generating technical report...")
-            exported_files = export_technical_report(findings, base_path)
-            click.echo(f"[SUCCESS] Generated technical report:")
-            for file_path in exported_files:
-                click.echo(f"  ✓ {file_path}")
-                
-        elif advanced:
-            # Advanced export
-            if format == "html":
-                html_generator = AdvancedHTMLGenerator()
-                html_path = html_generator.export(findings, f"{base_path}.html")
-                click.echo(f"[SUCCESS] Advanced HTML report generated: {html_path}")
-                
-            elif format == "pdf":
-                # Generate HTML first, then PDF
-                html_generator = AdvancedHTMLGenerator()
-                html_path = html_generator.export(findings, f"{base_path}.html")
-                
-                pdf_exporter = AdvancedPDFExporter()
-                pdf_path = pdf_exporter.export(html_path, f"{base_path}.pdf", format_type=theme)
-                click.echo(f"[SUCCESS] Advanced PDF report generated: {pdf_path}")
-                
-        else:
-            # Legacy export
-            html_path = html_generator.export(findings)
-            click.echo(f"[OK] HTML report generated: {html_path}")
+    Returns:
+        str: Path to the generated report (first file for multi-file formats)
+    """
+    report_path = None
+    
+    if format == "all":
+        # Export all formats
+        click.echo("[EXPORT] Generating all formats...")
+        exported_files = export_all_formats(findings, base_path)
+        report_path = exported_files[0] if exported_files else None
+        click.echo(f"[SUCCESS] Generated {len(exported_files)} files:")
+        for file_path in exported_files:
+            click.echo(f"  ✓ {file_path}")
             
-            if format == "pdf":
-                try:
-                    pdf_path = pdf_exporter.export(html_path)
-                    click.echo(f"[OK] PDF report generated: {pdf_path}")
-                    click.echo(f"[SUCCESS] Full report completed: {pdf_path}")
-                except Exception as pdf_error:
-                    click.echo(f"[ERROR] PDF generation failed: {str(pdf_error)}")
-                    click.echo(f"[INFO] HTML report is still available: {html_path}")
-                    click.echo("[TIP] Try running: ./install_dependencies.sh")
-            else:
-                click.echo(f"[SUCCESS] Full report completed: {html_path}")
+    elif format == "compliance":
+        # Export compliance pack
+        click.echo("[EXPORT] Generating compliance pack...")
+        exported_files = export_compliance_pack(findings, base_path)
+        report_path = exported_files[0] if exported_files else None
+        click.echo(f"[SUCCESS] Generated compliance pack ({len(exported_files)} files):")
+        for file_path in exported_files:
+            click.echo(f"  ✓ {file_path}")
             
-    except Exception as e:
-        click.echo(f"[ERROR] Report generation failed: {str(e)}", err=True)
-        sys.exit(1)
+    elif format == "executive":
+        # Export executive summary
+        click.echo("[EXPORT] Generating executive summary...")
+        exported_files = export_executive_summary(findings, base_path)
+        report_path = exported_files[0] if exported_files else None
+        click.echo(f"[SUCCESS] Generated executive summary:")
+        for file_path in exported_files:
+            click.echo(f"  ✓ {file_path}")
+            
+    elif format == "technical":
+        # Export technical report
+        click.echo("[EXPORT] Generating technical report...")
+        exported_files = export_technical_report(findings, base_path)
+        report_path = exported_files[0] if exported_files else None
+        click.echo(f"[SUCCESS] Generated technical report:")
+        for file_path in exported_files:
+            click.echo(f"  ✓ {file_path}")
+            
+    elif advanced:
+        # Advanced export
+        if format == "html":
+            advanced_html = AdvancedHTMLGenerator()
+            report_path = advanced_html.export(findings, f"{base_path}.html")
+            click.echo(f"[SUCCESS] Advanced HTML report generated: {report_path}")
+            
+        elif format == "pdf":
+            # Generate HTML first, then PDF
+            advanced_html = AdvancedHTMLGenerator()
+            html_path = advanced_html.export(findings, f"{base_path}.html")
+            
+            advanced_pdf = AdvancedPDFExporter()
+            report_path = advanced_pdf.export(html_path, f"{base_path}.pdf", format_type=theme)
+            click.echo(f"[SUCCESS] Advanced PDF report generated: {report_path}")
+            
+    else:
+        # Legacy export
+        html_path = report_path = html_generator.export(findings)
+        click.echo(f"[OK] HTML report generated: {html_path}")
+        
+        if format == "pdf":
+            try:
+                pdf_path = report_path = pdf_exporter.export(html_path)
+                click.echo(f"[OK] PDF report generated: {pdf_path}")
+                click.echo(f"[SUCCESS] Full report completed: {pdf_path}")
+            except Exception as pdf_error:
+                click.echo(f"[ERROR] PDF generation failed: {str(pdf_error)}")
+                click.echo(f"[INFO] HTML report is still available: {html_path}")
+                click.echo("[TIP] Try running: ./install_dependencies.sh")
+        else:
+            click.echo(f"[SUCCESS] Full report completed: {html_path}")
+    
+    return report_path
 
 @cli.command()
 def export_info():
@@ -346,6 +389,13 @@ def export_info():
         click.echo(f"[ERROR] Failed to get export info: {str(e)}", err=True)
         sys.exit(1)
 
+@cli.command()
+def clear_cache():
+    """Delete all cached AI responses"""
+    from ai.response_cache import ResponseCache
+    ResponseCache().clear()
+    click.echo("[OK] AI response cache cleared")
+
 # Custom Tools Commands
 @cli.group()
 def tools():
@@ -406,7 +456,8 @@ def list():
 @click.option('--format', '-fmt', default='html', 
               type=click.Choice(['html', 'pdf']), help='Export format')
 @click.option('--recursive', '-r', is_flag=True, help='Search recursively')
-def batch_process(directory, format, recursive):
+@click.option('--batch', is_flag=True, help='Use the OpenAI Batch API (half price, results within 24h)')
+def batch_process(directory, format, recursive, batch):
     """Process all scan files in a directory"""
     click.echo(f"[LAUNCH] Batch processing directory: {directory}")
     
@@ -415,7 +466,7 @@ def batch_process(directory, format, recursive):
         processor = AutoProcessor()
         
         # Find and process all scan files
-        reports = processor.process_directory(directory, format)
+        reports = processor.process_directory(directory, format, use_batch_api=batch)
         
         if reports:
             click.echo(f"[SUCCESS] Generated {len(reports)} reports:")
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Test script for the fused AI analyzer
+Tests response parsing fallbacks and per-finding request deduplication
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from ai import analyzer, severity_classifier
+from ai.prompt_templates import analysis_prompt, SHARED_REQUEST
+from ai.severity_classifier import content_hash, dedupe_findings, _SEVERITY_FIELDS
+from ai.summarizer import generate_fallback_summary
+from ai.severity_classifier import classify_by_rules
+from ai.remediation_generator import generate_fallback_remediation
+
+FINDING = {
+    "title": "Reflected XSS",
+    "description": "User input is reflected without encoding",
+    "impact": "Session theft",
+    "category": "web",
+    "host": "10.0.0.5"
+}
+
+class FakeAsyncClient:
+    """Stands in for AIClient, answering every analysis prompt with canned JSON"""
+    
+    def __init__(self, fail_on=None):
+        self.client = True
+        self.max_concurrency = 4
+        self.prompts = []
+        self.fail_on = fail_on
+    
+    async def chat_completion_async(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        if self.fail_on and self.fail_on in prompt:
+            raise RuntimeError("request failed")
+        return '{"summary": "AI summary", "severity": "High", "remediation": "AI fix"}'
+    
+    def run_async(self, coro):
+        return asyncio.run(coro)
+
+def test_parse_analysis_fallbacks():
+    """Test parse_analysis field by field"""
+    print("🧪 Testing parse_analysis fallbacks...")
+    
+    # Complete object wrapped in prose
+    result = analyzer.parse_analysis(
+        'Here you go: {"summary": "S", "severity": "critical", "remediation": "R"} done', FINDING
+    )
+    assert result == {"summary": "S", "severity": "Critical", "remediation": "R"}
+    
+    # Missing fields fall back one by one
+    result = analyzer.parse_analysis('{"summary": "S"}', FINDING)
+    assert result["summary"] == "S"
+    assert result["severity"] == classify_by_rules(FINDING)
+    assert result["remediation"] == generate_fallback_remediation(FINDING)
+    
+    # Malformed JSON, plain text and an empty response use every fallback
+    fallback = {
+        "summary": generate_fallback_summary(FINDING),
+        "severity": classify_by_rules(FINDING),
+        "remediation": generate_fallback_remediation(FINDING)
+    }
+    for response in ('{"summary": ', 'I cannot help with that.', ''):
+        assert analyzer.parse_analysis(response, FINDING) == fallback
+    
+    # A scanner-supplied severity wins over the AI's answer
+    result = analyzer.parse_analysis('{"severity": "Low"}', dict(FINDING, severity="high"))
+    assert result["severity"] == "High"
+    
+    print("✅ parse_analysis fallbacks behave as expected")
+
+def test_analyze_all_dedupes():
+    """Test that analyze_all sends one request per distinct finding"""
+    print("🧪 Testing analyze_all deduplication...")
+    
+    findings = [
+        FINDING,
+        dict(FINDING, host="10.0.0.6"),
+        dict(FINDING, title="Stored XSS")
+    ]
+    fake = FakeAsyncClient()
+    original = analyzer.get_ai_client
+    analyzer.get_ai_client = lambda: fake
+    try:
+        results = analyzer.analyze_all(findings)
+    finally:
+        analyzer.get_ai_client = original
+    
+    assert len(fake.prompts) == 2
+    assert len(results) == 3
+    assert all(result["summary"] == "AI summary" for result in results)
+    # The request shared by both hosts names neither of them; the single finding keeps its host
+    shared = [prompt for prompt in fake.prompts if "Reflected XSS" in prompt]
+    assert len(shared) == 1
+    assert "10.0.0.5" not in shared[0] and "10.0.0.6" not in shared[0]
+    assert any("Stored XSS" in prompt and "10.0.0.5" in prompt for prompt in fake.prompts)
+    
+    print(f"✅ {len(findings)} findings analyzed with {len(fake.prompts)} requests")
+
+def test_analyze_all_request_failure():
+    """Test that a failed request falls back for its findings only"""
+    print("🧪 Testing analyze_all request failure...")
+    
+    findings = [FINDING, dict(FINDING, title="Stored XSS")]
+    fake = FakeAsyncClient(fail_on="Stored XSS")
+    original = analyzer.get_ai_client
+    analyzer.get_ai_client = lambda: fake
+    try:
+        results = analyzer.analyze_all(findings)
+    finally:
+        analyzer.get_ai_client = original
+    
+    assert results[0]["summary"] == "AI summary"
+    assert results[1]["summary"] == generate_fallback_summary(findings[1])
+    
+    print("✅ Failed request fell back to rule-based output")
+
+def test_dedupe_keeps_versions_apart():
+    """Test that version numbers are not mistaken for host addresses"""
+    print("🧪 Testing dedupe on version strings...")
+    
+    findings = [
+        {"title": "Outdated Java", "description": "Java 1.8.0.251 detected", "host": "10.0.0.5"},
+        {"title": "Outdated Java", "description": "Java 1.8.0.401 detected on 10.0.0.6", "host": "10.0.0.6"},
+        {"title": "Outdated Java", "description": "Java 1.8.0.401 detected on 10.0.0.7", "host": "10.0.0.7"}
+    ]
+    assert content_hash(findings[0], _SEVERITY_FIELDS) != content_hash(findings[1], _SEVERITY_FIELDS)
+    
+    keys, unique = dedupe_findings(findings, _SEVERITY_FIELDS)
+    assert len(unique) == 2 and keys[1] == keys[2]
+    # The shared request keeps the version and drops only the host
+    shared, _ = unique[keys[1]]
+    assert "1.8.0.401" in shared["description"] and "10.0.0" not in shared["description"]
+    
+    print("✅ Different versions stay separate requests")
+
+def test_shared_request_fallback_uses_original():
+    """Test that rule-based fallbacks see the whole finding, not the prompt copy"""
+    print("🧪 Testing fallbacks for shared requests...")
+    
+    findings = [
+        {"title": "Unusual response", "description": "Odd output", "category": "web_vulnerability", "host": host}
+        for host in ("10.0.0.5", "10.0.0.6")
+    ]
+    fake = FakeAsyncClient()
+    
+    async def unparseable(prompt, **kwargs):
+        fake.prompts.append(prompt)
+        return "I am not sure"
+    fake.chat_completion_async = unparseable
+    
+    original = severity_classifier.get_ai_client
+    severity_classifier.get_ai_client = lambda: fake
+    try:
+        severities = severity_classifier.classify_all(findings)
+    finally:
+        severity_classifier.get_ai_client = original
+    
+    # One shared request, and the category rule still applies to its fallback
+    assert len(fake.prompts) == 1
+    assert severities == [classify_by_rules(findings[0])] * 2 == ["High", "High"]
+    
+    print("✅ Shared-request fallbacks keep the finding's category")
+
+def test_target_line():
+    """Test that only shared requests leave out the Host/Target line"""
+    print("🧪 Testing Host/Target lines...")
+    
+    assert "\nHost/Target: Unknown target\n" in analysis_prompt({"title": "No target"})
+    assert "\nHost/Target: None\n" in analysis_prompt({"title": "No target", "host": None})
+    assert "\nHost/Target: 10.0.0.5\n" in analysis_prompt(FINDING)
+    assert "Host/Target" not in analysis_prompt(dict(FINDING, **{SHARED_REQUEST: True}))
+    
+    print("✅ Host/Target lines behave as expected")
+
+def main():
+    """Main test function"""
+    tests = [
+        test_parse_analysis_fallbacks,
+        test_analyze_all_dedupes,
+        test_analyze_all_request_failure,
+        test_dedupe_keeps_versions_apart,
+        test_shared_request_fallback_uses_original,
+        test_target_line
+    ]
+    
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ Test {test.__name__} failed: {e!r}")
+            failed += 1
+    
+    print(f"\n📊 {len(tests) - failed}/{len(tests)} analyzer tests passed")
+    return failed == 0
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Test script for the AI client plumbing
+Tests Batch API output parsing, rate limiter wait math and the response cache
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from ai.openai_client import AIClient
+from ai.rate_limiter import RateLimiter
+from ai.response_cache import ResponseCache
+from ai.severity_classifier import parse_batch_response
+
+def batch_line(custom_id, content=None, status_code=200, error=None, body=None):
+    """Build one line of a Batch API output file"""
+    if body is None:
+        body = {"choices": [{"message": {"content": content}}]}
+    return json.dumps({
+        "custom_id": custom_id,
+        "response": {"status_code": status_code, "body": body},
+        "error": error
+    })
+
+BATCH_OUTPUT = "\n".join([
+    batch_line("summary-0", "  Summary text \n"),
+    batch_line("severity-0", error={"code": "server_error", "message": "boom"}),
+    batch_line("remediation-0", "Rate limited", status_code=429),
+    batch_line("summary-1", body={"error": "no choices"}),
+    "",
+    batch_line("severity-1", "High")
+])
+
+def fake_batch_client(status, output_file_id="file-out"):
+    """Build an AIClient whose OpenAI client serves one batch and its output file"""
+    client = AIClient.__new__(AIClient)
+    client.client = SimpleNamespace(
+        batches=SimpleNamespace(
+            retrieve=lambda batch_id: SimpleNamespace(status=status, output_file_id=output_file_id)
+        ),
+        files=SimpleNamespace(
+            content=lambda file_id: SimpleNamespace(text=BATCH_OUTPUT)
+        )
+    )
+    return client
+
+def test_batch_output_parsing():
+    """Test retrieve_file_content and poll_batch on a JSONL output file"""
+    print("🧪 Testing Batch API output parsing...")
+    
+    results = fake_batch_client("completed").retrieve_file_content("file-out")
+    # Error records, non-200 responses, malformed bodies and blank lines are skipped
+    assert results == {"summary-0": "Summary text", "severity-1": "High"}
+    
+    assert fake_batch_client("completed").poll_batch("batch-1") == results
+    for status in ("validating", "in_progress", "finalizing"):
+        assert fake_batch_client(status).poll_batch("batch-1") is None
+    assert fake_batch_client("failed").poll_batch("batch-1") == {}
+    assert fake_batch_client("completed", output_file_id=None).poll_batch("batch-1") == {}
+    
+    print(f"✅ Parsed {len(results)} successful responses")
+
+def test_parse_batch_response():
+    """Test parsing of batched-prompt JSON arrays"""
+    print("🧪 Testing parse_batch_response...")
+    
+    response = 'Results:\n[{"id": 0, "severity": "High"}, {"severity": "Low"}, "text", {"id": 2}]\nDone'
+    assert parse_batch_response(response) == [{"id": 0, "severity": "High"}, {"id": 2}]
+    assert parse_batch_response('[{"id": 0,') == []
+    assert parse_batch_response('{"id": 0}') == []
+    assert parse_batch_response('') == []
+    
+    print("✅ parse_batch_response keeps only objects with an id")
+
+def test_rate_limiter_wait_math():
+    """Test RateLimiter._reserve capacity accounting and wait times"""
+    print("🧪 Testing RateLimiter._reserve...")
+    
+    # Requests per minute: 60 RPM refills one request per second
+    limiter = RateLimiter(max_rpm=60)
+    assert limiter._reserve(0) == 0.0
+    assert limiter._requests < 60
+    limiter._requests = 0.0
+    assert abs(limiter._reserve(0) - 1.0) < 0.01
+    # Waiting does not consume capacity
+    assert limiter._requests < 1
+    
+    # Half a minute of refill covers the next request
+    limiter._requests = 0.0
+    limiter._updated -= 30
+    assert limiter._reserve(0) == 0.0
+    assert abs(limiter._requests - 29) < 0.01
+    
+    # Tokens per minute: the shortfall is refilled at max_tpm / 60 per second
+    limiter = RateLimiter(max_tpm=600)
+    assert limiter._reserve(300) == 0.0
+    assert abs(limiter._reserve(600) - 30.0) < 0.1
+    assert abs(limiter._tokens - 300) < 1
+    
+    # A request larger than the whole budget waits for a full bucket, not forever
+    limiter._tokens = 0.0
+    assert abs(limiter._reserve(10000) - 60.0) < 0.1
+    
+    # With both limits the longer wait wins
+    limiter = RateLimiter(max_rpm=60, max_tpm=600)
+    limiter._requests = 0.0
+    limiter._tokens = 0.0
+    assert abs(limiter._reserve(100) - 10.0) < 0.1
+    
+    print("✅ Rate limiter waits match the refill rates")
+
+def test_rate_limiter_from_env():
+    """Test that bad OPENAI_MAX_RPM / OPENAI_MAX_TPM values are ignored"""
+    print("🧪 Testing RateLimiter.from_env...")
+    
+    saved = {name: os.environ.get(name) for name in ("OPENAI_MAX_RPM", "OPENAI_MAX_TPM")}
+    try:
+        os.environ["OPENAI_MAX_RPM"] = "lots"
+        os.environ["OPENAI_MAX_TPM"] = "90000"
+        limiter = RateLimiter.from_env()
+        assert limiter.max_rpm is None and limiter.max_tpm == 90000
+        
+        os.environ["OPENAI_MAX_TPM"] = "1.5"
+        assert RateLimiter.from_env() is None
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+    
+    print("✅ Invalid limits are treated as unset")
+
+def test_response_cache_round_trip():
+    """Test ResponseCache get/set, keys, expiry and clearing"""
+    print("🧪 Testing ResponseCache round-trips...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "cache.sqlite"
+        cache = ResponseCache(path)
+        key = ResponseCache.make_key("gpt-3.5-turbo", 0.5, 1500, "prompt", system="system")
+        
+        assert cache.get(key) is None
+        cache.set(key, "first")
+        assert cache.get(key) == "first"
+        cache.set(key, "second")
+        assert cache.get(key) == "second"
+        
+        # Entries are shared with other instances on the same file
+        assert ResponseCache(path).get(key) == "second"
+        
+        # Every request parameter is part of the key
+        variants = [
+            ResponseCache.make_key("gpt-4", 0.5, 1500, "prompt", system="system"),
+            ResponseCache.make_key("gpt-3.5-turbo", 0.2, 1500, "prompt", system="system"),
+            ResponseCache.make_key("gpt-3.5-turbo", 0.5, 500, "prompt", system="system"),
+            ResponseCache.make_key("gpt-3.5-turbo", 0.5, 1500, "other", system="system"),
+            ResponseCache.make_key("gpt-3.5-turbo", 0.5, 1500, "prompt", {"type": "json_object"}, "system"),
+            ResponseCache.make_key("gpt-3.5-turbo", 0.5, 1500, "prompt", system="other")
+        ]
+        assert len(set(variants + [key])) == len(variants) + 1
+        assert all(cache.get(variant) is None for variant in variants)
+        
+        # Entries older than max_age are ignored, and evicted when the cache is opened
+        cache._connect().execute("UPDATE responses SET ts = ?", (int(time.time()) - 3600,))
+        assert ResponseCache(path, max_age=None).get(key) == "second"
+        assert cache.get(key) == "second"
+        assert ResponseCache(path, max_age=60).get(key) is None
+        assert ResponseCache(path, max_age=None).get(key) is None
+        
+        cache.set(key, "third")
+        
+        cache.clear()
+        assert cache.get(key) is None
+    
+    print("✅ Response cache round-trips behave as expected")
+
+def main():
+    """Main test function"""
+    tests = [
+        test_batch_output_parsing,
+        test_parse_batch_response,
+        test_rate_limiter_wait_math,
+        test_rate_limiter_from_env,
+        test_response_cache_round_trip
+    ]
+    
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ Test {test.__name__} failed: {e!r}")
+            failed += 1
+    
+    print(f"\n📊 {len(tests) - failed}/{len(tests)} AI client tests passed")
+    return failed == 0
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -123,6 +123,93 @@ def test_basic_functionality():
         traceback.print_exc()
         return False
 
+def advanced_report_fixture():
+    """Mixed-severity findings with lowercase/unknown severities and CVSS values on the bucket boundaries"""
+    return [
+        {"title": "RCE", "severity": "Critical", "cvss_score": 9, "category": "Injection", "host": "10.0.0.1",
+         "service": "http", "source": "nuclei", "confidence": "High", "exploitability": "High", "business_impact": "High"},
+        {"title": "SQLi", "severity": "high", "cvss_score": 8, "category": "Injection", "host": "10.0.0.1",
+         "service": "http", "source": "burp", "exploitability": "Medium", "business_impact": "High"},
+        {"title": "Weak TLS", "severity": "HIGH", "cvss_score": 7, "category": "Crypto", "host": "10.0.0.2",
+         "service": "https", "source": "nmap", "exploitability": "Low", "business_impact": "Medium"},
+        {"title": "Info leak", "severity": "Medium", "cvss_score": 6, "category": "Disclosure", "host": "10.0.0.2",
+         "exploitability": "High", "business_impact": "Low"},
+        {"title": "Banner", "severity": "medium", "cvss_score": 4, "host": "10.0.0.3", "source": "nmap"},
+        {"title": "Cookie flag", "severity": "Low", "cvss_score": 3, "category": "Config",
+         "exploitability": "Unknown", "business_impact": "Unknown"},
+        {"title": "Odd", "severity": "Unknown", "cvss_score": 3.9, "category": "Config", "host": "10.0.0.3"},
+        {"title": "Note", "severity": "info", "cvss_score": 6.5, "category": "Disclosure"},
+        {"title": "Edge", "severity": "Low", "cvss_score": 8.9, "category": "Crypto",
+         "exploitability": "medium", "business_impact": "high"},
+        {"title": "No CVSS", "severity": "Critical"}
+    ]
+
+def test_advanced_report_aggregates():
+    """Pin the advanced HTML generator's statistics, charts, risk matrix and next steps"""
+    from exporters.html_generator_advanced import AdvancedHTMLGenerator
+    generator = AdvancedHTMLGenerator()
+    findings = advanced_report_fixture()
+    
+    stats = generator.generate_advanced_statistics(findings)
+    assert stats == {
+        'total': 10,
+        'by_severity': {'critical': 2, 'high': 2, 'medium': 2, 'low': 2, 'info': 1, 'unknown': 1},
+        'by_category': {'Injection': 2, 'Crypto': 2, 'Disclosure': 2, 'Other': 2, 'Config': 2},
+        'by_confidence': {'High': 1, 'Medium': 9},
+        'by_exploitability': {'High': 2, 'Medium': 1, 'Low': 1, 'Unknown': 5, 'medium': 1},
+        'by_source': {'nuclei': 1, 'burp': 1, 'nmap': 2, 'Unknown': 6},
+        'by_host': {'10.0.0.1': 2, '10.0.0.2': 2, '10.0.0.3': 2, 'Unknown': 4},
+        'by_service': {'http': 2, 'https': 1, 'Unknown': 7},
+        # Statistics buckets are inclusive upper bounds (<= 3, <= 6, <= 8)
+        'cvss_distribution': {'0-3': 2, '4-6': 3, '7-8': 3, '9-10': 2},
+        'trend_analysis': {},
+        'compliance_violations': {},
+        'remediation_effort': {'quick': 0, 'medium': 0, 'complex': 0},
+        'business_impact': {'high': 0, 'medium': 0, 'low': 0}
+    }
+    
+    charts = generator.generate_charts_data(findings)
+    assert charts['severity_distribution']['data'] == [2, 2, 2, 2, 2]
+    assert charts['category_distribution']['labels'] == ['Injection', 'Crypto', 'Disclosure', 'Other', 'Config']
+    assert charts['category_distribution']['data'] == [2, 2, 2, 2, 2]
+    assert charts['category_distribution']['colors'] == ['#007bff', '#28a745', '#ffc107', '#dc3545', '#17a2b8']
+    # Chart buckets are exclusive upper bounds (< 4, < 7, < 9)
+    assert charts['cvss_distribution']['data'] == [3, 3, 3, 1]
+    assert charts['trend_analysis'] == {'labels': [], 'data': [], 'colors': []}
+    
+    matrix = generator.generate_risk_matrix(findings)
+    titles = {
+        likelihood: {impact: [finding['title'] for finding in cell] for impact, cell in row.items()}
+        for likelihood, row in matrix.items()
+    }
+    assert titles == {
+        'high_likelihood': {'high_impact': ['RCE'], 'medium_impact': [], 'low_impact': ['Info leak']},
+        'medium_likelihood': {
+            'high_impact': ['SQLi', 'Edge'],
+            'medium_impact': ['Banner', 'Cookie flag', 'Odd', 'Note', 'No CVSS'],
+            'low_impact': []
+        },
+        'low_likelihood': {'high_impact': [], 'medium_impact': ['Weak TLS'], 'low_impact': []}
+    }
+    
+    steps = generator.generate_next_steps(findings, stats)
+    assert [(step['step'], step['action']) for step in steps] == [
+        (1, 'Emergency Response'), (2, 'Vulnerability Prioritization'), (3, 'Remediation Planning'),
+        (4, 'Implementation'), (5, 'Validation')
+    ]
+    calm = [finding for finding in findings if finding['severity'] != 'Critical']
+    steps = generator.generate_next_steps(calm, generator.generate_advanced_statistics(calm))
+    assert [step['step'] for step in steps] == [1, 2, 3, 4]
+    assert steps[0]['action'] == 'Vulnerability Prioritization'
+    
+    # Processed findings stay plain JSON data with their own collections
+    processed = generator.process_findings(findings)
+    json.dumps(processed)
+    processed[0]['references'].append('https://example.com')
+    assert processed[1]['references'] == []
+    
+    print("[OK] Advanced report aggregates match the pinned values")
+
 def generate_simple_html_report(findings):
     """Generate simple HTML report without Jinja2"""
     html = """<!DOCTYPE html>
@@ -186,3 +273,4 @@ def generate_simple_html_report(findings):
 
 if __name__ == "__main__":
     test_basic_functionality()
+    test_advanced_report_aggregates()
@@ -4,7 +4,7 @@ Uses AI to parse and extract findings from custom tool outputs
 """
 
 from ai.prompt_templates import summary_prompt, severity_prompt
-from ai.openai_client import ai_client
+from ai.openai_client import get_ai_client
 
 def parse_output(output_file_path):
     """
@@ -27,7 +27,7 @@ def parse_output(output_file_path):
         
         # Generate AI-powered analysis
         prompt = custom_tool_analysis_prompt(content, output_file_path)
-        summary = ai_client.chat_completion(prompt, max_tokens=2000)
+        summary = get_ai_client().chat_completion(prompt, max_tokens=2000)
         
         return summary
     
@@ -55,7 +55,7 @@ def extract_findings(output_file_path, tool_name=None):
         
         # Generate structured findings using AI
         prompt = findings_extraction_prompt(content, tool_name or "custom_tool")
-        findings_text = ai_client.chat_completion(prompt, max_tokens=2500)
+        findings_text = get_ai_client().chat_completion(prompt, max_tokens=2500)
         
         # Try to parse the AI response into structured findings
         findings = parse_ai_findings_response(findings_text, output_file_path, tool_name)
@@ -225,6 +225,26 @@ def parse_finding_block(block, output_file, tool_name):
     except Exception as e:
         return None
 
+# Keyword sets per category for analyze_output_patterns
+_OUTPUT_PATTERNS = {
+    'vulnerabilities': frozenset({
+        'vulnerability', 'vuln', 'cve-', 'exploit', 'injection',
+        'xss', 'sql injection', 'buffer overflow', 'rce'
+    }),
+    'network_issues': frozenset({
+        'open port', 'service', 'banner', 'version', 'protocol',
+        'ssl', 'tls', 'certificate', 'cipher'
+    }),
+    'web_issues': frozenset({
+        'http', 'https', 'web', 'cookie', 'session', 'authentication',
+        'authorization', 'redirect', 'cors'
+    }),
+    'info_disclosure': frozenset({
+        'information disclosure', 'directory listing', 'backup',
+        'config', 'debug', 'error', 'stacktrace'
+    })
+}
+
 def analyze_output_patterns(content):
     """
     Analyze output for common security tool patterns
@@ -235,32 +255,12 @@ def analyze_output_patterns(content):
     Returns:
         dict: Analysis results with pattern matches
     """
-    patterns = {
-        'vulnerabilities': [
-            'vulnerability', 'vuln', 'cve-', 'exploit', 'injection',
-            'xss', 'sql injection', 'buffer overflow', 'rce'
-        ],
-        'network_issues': [
-            'open port', 'service', 'banner', 'version', 'protocol',
-            'ssl', 'tls', 'certificate', 'cipher'
-        ],
-        'web_issues': [
-            'http', 'https', 'web', 'cookie', 'session', 'authentication',
-            'authorization', 'redirect', 'cors'
-        ],
-        'info_disclosure': [
-            'information disclosure', 'directory listing', 'backup',
-            'config', 'debug', 'error', 'stacktrace'
-        ]
-    }
-    
     content_lower = content.lower()
-    matches = {}
     
-    for category, keywords in patterns.items():
-        matches[category] = sum(1 for keyword in keywords if keyword in content_lower)
-    
-    return matches
+    return {
+        category: sum(1 for keyword in keywords if keyword in content_lower)
+        for category, keywords in _OUTPUT_PATTERNS.items()
+    }
 
 def suggest_remediation_for_tool_output(content, tool_name):
     """
@@ -285,7 +285,7 @@ Provide actionable remediation steps for any security issues identified. If no s
 
 Remediation Recommendations:"""
 
-        return ai_client.chat_completion(prompt, max_tokens=1500)
+        return get_ai_client().chat_completion(prompt, max_tokens=1500)
     
     except Exception as e:
         return "Manual review of tool output recommended. Apply security best practices for identified issues."
@@ -0,0 +1,33 @@
+"""
+Per-thread Output Capture
+Keeps the prints of concurrently running workers from interleaving
+"""
+
+import io
+import threading
+
+class ThreadOutput(io.TextIOBase):
+    """stdout wrapper that sends each worker thread's prints to its own buffer"""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+    
+    def capture(self):
+        """Start buffering output written from the current thread"""
+        self.local.buffer = io.StringIO()
+    
+    def release(self):
+        """Stop buffering for the current thread and return what was captured"""
+        buffer = self.local.buffer
+        self.local.buffer = None
+        return buffer.getvalue()
+    
+    def write(self, text):
+        buffer = getattr(self.local, 'buffer', None)
+        if buffer is not None:
+            return buffer.write(text)
+        return self.stream.write(text)
+    
+    def flush(self):
+        self.stream.flush()